@@ -3,42 +3,48 @@ from __future__ import annotations
 
 from datetime import date as _date
 
-import pandas as pd
-import numpy as np
-
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 
-from src.leagues.nba.trends.matchup_insights import get_matchup_insights
+import src.leagues.nba.schema  # noqa: F401  (registers the NBA dataset dtypes)
+from src.leagues.nba.trends.matchup_insights import get_matchup_insights, get_slate_insights, load_team_results
 from src.common.paths import CSV
-from src.common.response import csv_resp
-from src.leagues.nba.api.nba_data import load_games_df
-from src.leagues.nba.api.nba_leaders import get_leaders_payload
+from src.common.storage import published_path
+from src.common.response import FastJSONProvider, csv_resp
+from src.common import metrics
+from src.common.metrics import note_error
+from src.common.datasets import STORE
+from src.leagues.nba.api.nba_schedule import games_between, games_on, load_schedule_index
+from src.leagues.nba.api.nba_game_logs import get_player_gamelog, load_player_log_index
+from src.leagues.nba.api.nba_leaders import custom_card, get_leaders_payload, warm_leaders_cache
+from src.leagues.nba.api.nba_player_search import load_player_search_index, search_players
 
 app = Flask(__name__)
-CORS(app, supports_credentials=True)
-
-
-def _records(df: pd.DataFrame):
-    """Convert dataframe to JSON-serializable records (NaN -> None)."""
-    return df.where(pd.notnull(df), None).to_dict(orient="records")
+app.json = FastJSONProvider(app)
+CORS(app, supports_credentials=True, expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"])
+metrics.install(app)
 
 
 @app.get("/api/health")
 def health():
-    return jsonify({k: v.exists() for k, v in CSV.items()})
+    return jsonify({k: published_path(k).exists() for k in CSV})
+
+
+@app.get("/api/metrics")
+def api_metrics():
+    # Prometheus text format: route latency/bytes/rows, dataset cache + versions
+    return metrics.render(STORE)
 
 
 # ---------------- NBA: schedule ----------------
 @app.get("/api/nba/schedule/daily")
 def nba_daily_schedule():
-    target = request.args.get("date") or date.today().isoformat()
+    target = request.args.get("date") or _date.today().isoformat()
+    team = request.args.get("team")
     try:
-        df = load_games_df()
-        day_df = df[df["GAME_DATE_EST"] == target].copy().sort_values(["GAME_DATE_EST", "GAME_ID"])
-        return jsonify(_records(day_df))
+        return jsonify(games_on(target, team=team))
     except Exception as e:
-        print("nba_daily_schedule error:", e)
+        note_error("nba_daily_schedule", e)
         return jsonify([])
 
 
@@ -46,16 +52,14 @@ def nba_daily_schedule():
 def nba_schedule_range():
     start = request.args.get("start")
     end = request.args.get("end")
+    team = request.args.get("team")
     if not start or not end:
         return jsonify([])
 
     try:
-        df = load_games_df()
-        out = df[(df["GAME_DATE_EST"] >= start) & (df["GAME_DATE_EST"] <= end)].copy()
-        out = out.sort_values(["GAME_DATE_EST", "GAME_ID"])
-        return jsonify(_records(out))
+        return jsonify(games_between(start, end, team=team))
     except Exception as e:
-        print("nba_schedule_range error:", e)
+        note_error("nba_schedule_range", e)
         return jsonify([])
 
 
@@ -102,46 +106,39 @@ def nba_league_leaders():
     min_gp = request.args.get("min_gp") or request.args.get("minGp") or 10
     limit = request.args.get("limit") or 5
 
+    # Optional custom leaderboard, e.g. ?expr=PTS%2BREB%2BAST&label=PRA
+    expr = request.args.get("expr")
+
     try:
-        payload = get_leaders_payload(min_gp=int(min_gp), limit=int(limit))
+        custom = None
+        if expr:
+            custom = custom_card(
+                expr,
+                label=request.args.get("label"),
+                fmt=request.args.get("format") or "1dp",
+                attempts_expr=request.args.get("attempts"),
+                min_attempts=float(request.args.get("min_attempts") or 0),
+            )
+        payload = get_leaders_payload(min_gp=int(min_gp), limit=int(limit), custom=custom)
         return jsonify(payload)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print("nba_league_leaders error:", e)
+        note_error("nba_league_leaders", e)
         return jsonify({"minGp": int(min_gp), "limit": int(limit), "cards": []})
 
 
 # ---------------- NBA: search endpoints ----------------
 @app.get("/api/nba/players/search")
 def nba_player_search():
-    q = (request.args.get("q") or "").strip().lower()
+    q = (request.args.get("q") or "").strip()
     if not q:
         return jsonify([])
 
     try:
-        df = pd.read_csv(CSV["nba_roster_master"])
-
-        cols = [c for c in ["PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION"] if c in df.columns]
-        df = df[cols].drop_duplicates(subset=["PLAYER_ID"]).copy()
-
-        df["PLAYER_NAME"] = df["PLAYER_NAME"].astype(str)
-        mask = df["PLAYER_NAME"].str.lower().str.contains(q, na=False)
-        out = df[mask].head(25).copy()
-
-        out = out.where(pd.notnull(out), None)
-
-        return jsonify(
-            [
-                {
-                    "playerId": int(r["PLAYER_ID"]) if r.get("PLAYER_ID") is not None else None,
-                    "name": r.get("PLAYER_NAME"),
-                    "teamId": int(r["TEAM_ID"]) if r.get("TEAM_ID") is not None else None,
-                    "teamAbbr": r.get("TEAM_ABBREVIATION"),
-                }
-                for r in out.to_dict(orient="records")
-            ]
-        )
+        return jsonify(search_players(q, limit=25))
     except Exception as e:
-        print("nba_player_search error:", e)
+        note_error("nba_player_search", e)
         return jsonify([])
 
 # ---------------- NBA: player game logs ----------------
@@ -168,51 +165,13 @@ def nba_player_gamelog(player_id: int):
     away_b = _to_bool(away)
 
     try:
-        path = CSV["nba_player_game_logs"]
-        if not path.exists():
-            return jsonify({"error": "player game logs not generated yet"}), 404
-
-        df = pd.read_csv(path)
-
-        if "PLAYER_ID" not in df.columns:
-            return jsonify({"error": "invalid game logs schema"}), 500
-
-        df["PLAYER_ID"] = pd.to_numeric(df["PLAYER_ID"], errors="coerce")
-        df = df[df["PLAYER_ID"] == player_id].copy()
-
-        if df.empty:
-            return jsonify([])
-
-        # Optional filters
-        if opp and "OPP_TEAM_ABBR" in df.columns:
-            df["OPP_TEAM_ABBR"] = df["OPP_TEAM_ABBR"].astype(str).str.upper()
-            df = df[df["OPP_TEAM_ABBR"] == opp]
-
-        if home_b is True and "IS_HOME" in df.columns:
-            df = df[df["IS_HOME"] == True]
-        if away_b is True and "IS_AWAY" in df.columns:
-            df = df[df["IS_AWAY"] == True]
-
-        # Sort newest first
-        if "GAME_DATE" in df.columns:
-            df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], errors="coerce")
-            sort_cols = ["GAME_DATE"]
-            if "GAME_ID" in df.columns:
-                sort_cols.append("GAME_ID")
-            df = df.sort_values(sort_cols, ascending=[False] * len(sort_cols))
-
-            # Convert back to ISO string for frontend
-            df["GAME_DATE"] = df["GAME_DATE"].dt.strftime("%Y-%m-%d")
-
-
-        df = df.head(last_n)
-
-        df = df.where(pd.notnull(df), None)
-        df = df.replace([np.nan, np.inf, -np.inf], None)
-        return jsonify(df.to_dict(orient="records"))
-
+        return jsonify(get_player_gamelog(player_id, last_n=last_n, opp=opp, home=home_b, away=away_b))
+    except FileNotFoundError:
+        return jsonify({"error": "player game logs not generated yet"}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 500
     except Exception as e:
-        print("nba_player_gamelog error:", e)
+        note_error("nba_player_gamelog", e)
         return jsonify([])
 
 @app.get("/api/nba/trends/matchup-insights")
@@ -224,8 +183,37 @@ def nba_matchup_insights():
         d = _date.fromisoformat(target)
         return jsonify(get_matchup_insights(away_team=away, home_team=home, target_date=d))
     except Exception as e:
-        print("nba_matchup_insights error:", e)
+        note_error("nba_matchup_insights", e)
         return jsonify({})
 
+
+@app.get("/api/nba/trends/matchup-insights/slate")
+def nba_matchup_insights_slate():
+    target = request.args.get("date") or _date.today().isoformat()
+    try:
+        d = _date.fromisoformat(target)
+        return jsonify(get_slate_insights(target_date=d))
+    except Exception as e:
+        note_error("nba_matchup_insights_slate", e)
+        return jsonify({"date": target, "games": []})
+
+def warm_caches() -> None:
+    """
+    Load every dataset and build the per-version indexes/payloads up front.
+
+    gunicorn.conf.py calls this in the master before forking, so all workers
+    start with the same (copy-on-write shared) frames and artifacts. After a
+    data refresh each worker rebuilds them for itself (see DatasetStore.preload).
+    """
+    for ds in STORE.preload():
+        ds.records
+    for build in (load_schedule_index, load_player_log_index, load_player_search_index, load_team_results,
+                  warm_leaders_cache):
+        try:
+            build()
+        except (FileNotFoundError, ValueError) as e:
+            print(f"warm_caches: skipped {build.__name__}: {e}")
+
+
 if __name__ == "__main__":
     app.run(debug=True)
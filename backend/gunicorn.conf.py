@@ -0,0 +1,36 @@
+# backend/gunicorn.conf.py
+# Multi-worker deployment:  gunicorn -c gunicorn.conf.py app:app
+#
+# Preload mode: the master imports the app, loads every dataset and builds
+# the derived indexes/payloads once, then forks, so workers start with those
+# pages shared copy-on-write instead of each loading at boot.
+#
+# This only saves the boot-time loads; workers do not share memory.
+# Limitations:
+# - Sharing only lasts until the data changes. After a pipeline refresh each
+#   worker loads the new snapshot and rebuilds its own records, indexes and
+#   payloads (N loads, N builds), and from then on holds a private copy, so
+#   memory grows with the worker count.
+# - Loading maps the Arrow file, but to_pandas() copies the nullable-int,
+#   string and null-containing columns into each worker; only the null-free
+#   categoricals and floats stay backed by the shared page cache. Refcount
+#   updates also un-share some preloaded pages over time.
+# - Metrics are per process: /api/metrics reports only the worker that
+#   happened to serve the scrape, not the whole server.
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get("SAP_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("SAP_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("SAP_THREADS", 4))
+preload_app = True
+
+
+def when_ready(server):
+    # runs in the master after the app is imported and before any worker forks
+    from app import warm_caches
+
+    warm_caches()
+    # keep the cyclic GC from touching (and so un-sharing) the preloaded objects
+    gc.freeze()
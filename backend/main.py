@@ -3,8 +3,10 @@ from datetime import datetime
 import numpy as np
 from src.common.paths import CSV, NBA_PROCESSED
 from src.common.image_urls import get_nba_player_image_url
-from src.leagues.nba.pipeline.fetch_data       import fetch_regular_season_logs
-from src.leagues.nba.pipeline.team_stats       import generate_team_season_stats
+from src.common.storage import publish_snapshot, read_dataset, read_manifest, write_dataset
+import src.leagues.nba.schema  # noqa: F401  (registers the NBA dataset dtypes)
+from src.leagues.nba.pipeline.fetch_data       import load_regular_season_logs
+from src.leagues.nba.pipeline.team_stats       import update_team_season_stats
 from src.leagues.nba.pipeline.team_utils       import standardize_team_names, extract_team_list
 from src.leagues.nba.pipeline.team_rosters     import generate_current_team_rosters
 from src.leagues.nba.pipeline.schedule         import fetch_schedule
@@ -13,24 +15,43 @@ from src.leagues.nba.pipeline.top_player_stats import get_top_player_stats_by_te
 from src.leagues.nba.pipeline.player_stats     import fetch_player_stats_per_game
 from src.leagues.nba.pipeline.nba_season       import current_nba_season 
 from src.leagues.nba.pipeline.player_game_logs import build_player_game_logs_csv
+from src.leagues.nba.pipeline import stats_client
 
 CURRENT_YEAR = datetime.now().year
 
-def run_pipeline():
+def run_pipeline(cache_mode=None):
+    # nba_api requests go through the on-disk response cache and the shared
+    # rate limit (cache_mode: on | replay | off, default NBA_STATS_CACHE)
+    cache = stats_client.install(cache_mode)
+
+    # Everything below lands in one snapshot directory; the API keeps serving
+    # the previous snapshot until the whole run succeeds and CURRENT flips.
+    with publish_snapshot():
+        _refresh_datasets()
+    print("📦 Published snapshot:", read_manifest().get("id"))
+    print("🗄️ nba_api response cache:", cache.summary())
+
+
+def _refresh_datasets():
     NBA_PROCESSED.mkdir(parents=True, exist_ok=True)
 
     # Keep your historical game logs pipeline
     print("🏀 Fetching NBA game logs (regular season only)...")
-    games = fetch_regular_season_logs(seasons=range(CURRENT_YEAR - 15, CURRENT_YEAR + 1))
-    games = standardize_team_names(games)
+    # finished seasons come from their cached partitions; only the current one is fetched
+    logs = load_regular_season_logs(seasons=range(CURRENT_YEAR - 15, CURRENT_YEAR + 1))
+    games = standardize_team_names(logs.games)
     print("✅ Data pulled:", len(games), "games")
 
     # ----- core files -----
-    team_stats = generate_team_season_stats(games)
+    try:
+        previous_team_stats = read_dataset("nba_team_stats")
+    except FileNotFoundError:
+        previous_team_stats = None
+    team_stats = update_team_season_stats(previous_team_stats, games, logs.refreshed)
     teams_df   = extract_team_list(games)
 
-    team_stats.to_csv(CSV["nba_team_stats"], index=False)
-    teams_df.to_csv(CSV["nba_teams"],       index=False)
+    write_dataset(team_stats, "nba_team_stats")
+    write_dataset(teams_df,   "nba_teams")
 
     # ----- season string for "current season" endpoints -----
     season_str = current_nba_season()  # e.g., "2025-26"
@@ -38,7 +59,7 @@ def run_pipeline():
     # ----- rosters (current season / current rosters) -----
     id_map = dict(zip(teams_df.TEAM_ID, teams_df.TEAM_NAME))
     rosters = generate_current_team_rosters(teams_df.TEAM_ID.tolist(), id_map)
-    rosters.to_csv(CSV["nba_rosters"], index=False, encoding="utf-8")  # optional debug output
+    write_dataset(rosters, "nba_rosters")  # optional debug output
 
     # ----- player stats (league-wide per game) -----
     print(f"📊 Fetching player per-game stats for {season_str}...")
@@ -68,27 +89,27 @@ def run_pipeline():
     # replace NaN/inf with None so JSON never breaks downstream
     master_roster = master_roster.replace([np.nan, np.inf, -np.inf], None)
 
-    master_roster.to_csv(CSV["nba_roster_master"], index=False, encoding="utf-8")
+    write_dataset(master_roster, "nba_roster_master")
     print("✅ Wrote:", CSV["nba_roster_master"].name)
 
     # ----- player game logs (current season) -----
-    build_player_game_logs_csv()
+    build_player_game_logs_csv(incremental=True)
     print("✅ Wrote:", CSV["nba_player_game_logs"].name)
 
 
     # ----- schedule & standings -----
     schedule = fetch_schedule(CURRENT_YEAR)
-    schedule.to_csv(CSV["nba_games"], index=False)
+    write_dataset(schedule, "nba_games")
 
     standings = fetch_standings(CURRENT_YEAR)
-    standings.to_csv(CSV["nba_standings"], index=False)
+    write_dataset(standings, "nba_standings")
 
     # ----- top players -----
     top = get_top_player_stats_by_team(season_str)
     top["PLAYER_IMAGE_URL"] = top["PLAYER_ID"].apply(get_nba_player_image_url)
-    top.to_csv(CSV["nba_top_players"], index=False)
+    write_dataset(top, "nba_top_players")
 
-    print("✅ Pipeline complete – all CSVs refreshed")
+    print("✅ Pipeline complete – all datasets refreshed")
 
 if __name__ == "__main__":
     run_pipeline()
@@ -0,0 +1,273 @@
+# src/common/datasets.py
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.common.paths import CSV
+from src.common.serialize import to_records
+from src.common.storage import conform, file_version, published_path, read_frame
+
+Normalizer = Callable[[pd.DataFrame], pd.DataFrame]
+
+# Shared frames are handed out as shallow copies (copy(deep=False)), which is
+# only safe under copy-on-write: always on from pandas 3, opt-in before it.
+if int(pd.__version__.split(".")[0]) < 3:  # pragma: no cover
+    pd.options.mode.copy_on_write = True
+
+# How long a loaded dataset is trusted before its file is checked again.
+# 0 checks on every access.
+RELOAD_CHECK_S = float(os.environ.get("SAP_RELOAD_CHECK_S", "1.0"))
+
+# (dataset key, artifact kind, "hit" | "build") -> count, for /api/metrics.
+# Plain counters without a lock: good enough for monitoring.
+DERIVED_STATS: Counter = Counter()
+
+
+def _artifact_kind(name: str) -> str:
+    # "json:TEAM_ID=1610612737" -> "json"; keeps metric label cardinality bounded
+    return name.split(":", 1)[0]
+
+
+def index_key(value: Any) -> str:
+    """Canonical lookup key: 1610612737, 1610612737.0 and "1610612737" all match."""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    return str(value)
+
+
+@dataclass(frozen=True)
+class GroupIndex:
+    """
+    Hash index over one column: row positions grouped by value.
+
+    `order` holds row positions sorted by group (file order inside a group);
+    `spans` maps index_key(value) -> (start, stop) into `order`. NA rows are
+    not indexed.
+    """
+
+    column: str
+    order: np.ndarray
+    spans: Dict[str, Tuple[int, int]]
+
+    def rows(self, value: Any) -> np.ndarray:
+        start, stop = self.spans.get(index_key(value), (0, 0))
+        return self.order[start:stop]
+
+    def rows_for(self, values: Iterable[Any]) -> np.ndarray:
+        """Rows matching any of `values`, in file order."""
+        keys = {index_key(v) for v in values}
+        parts = [self.rows(k) for k in keys]
+        if not parts:
+            return np.zeros(0, dtype="int64")
+        return np.sort(np.concatenate(parts))
+
+
+def build_group_index(df: pd.DataFrame, column: str) -> GroupIndex:
+    s = df[column]
+    present = s.notna().to_numpy(dtype=bool)
+    vals = s[present]
+    if pd.api.types.is_float_dtype(vals.dtype) and (vals % 1 == 0).all():
+        vals = vals.astype("int64")
+
+    codes, uniq = pd.factorize(vals.astype(str), sort=False)
+    order = np.flatnonzero(present)[np.argsort(codes, kind="stable")]
+    counts = np.bincount(codes, minlength=len(uniq))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype("int64")
+    spans = {str(k): (int(a), int(a + n)) for k, a, n in zip(uniq, starts, counts)}
+    return GroupIndex(column=column, order=order.astype("int64"), spans=spans)
+
+
+@dataclass
+class Dataset:
+    """
+    One loaded version of a processed file.
+
+    `df` is normalized once at load time; `records` and anything built with
+    `derived()` are computed lazily and live as long as this version does.
+    """
+
+    key: str
+    path: Path
+    version: int
+    df: pd.DataFrame
+    indexes: Dict[str, GroupIndex] = field(default_factory=dict, repr=False)
+    loaded_at: float = field(default_factory=time.time)
+    _records: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False)
+    # reentrant: builders may depend on other derived artifacts
+    _build_lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        if self._records is None:
+            with self._build_lock:
+                if self._records is None:
+                    self._records = to_records(self.df)
+        return self._records
+
+    def derived(self, name: str, build: Callable[["Dataset"], Any]) -> Any:
+        """
+        Return a per-version artifact (index, payload, ...), building it on
+        first use. Concurrent first calls build it once; the rest wait.
+        """
+        try:
+            value = self._derived[name]
+            DERIVED_STATS[(self.key, _artifact_kind(name), "hit")] += 1
+            return value
+        except KeyError:
+            pass
+        with self._build_lock:
+            if name not in self._derived:
+                self._derived[name] = build(self)
+                DERIVED_STATS[(self.key, _artifact_kind(name), "build")] += 1
+            return self._derived[name]
+
+    def index(self, column: str) -> GroupIndex:
+        """Group index for `column`: built at load time if declared, otherwise on first use."""
+        if column in self.indexes:
+            return self.indexes[column]
+        if column not in self.df.columns:
+            raise KeyError(column)
+        return self.derived(f"index:{column}", lambda ds: build_group_index(ds.df, column))
+
+
+class DatasetStore:
+    """
+    Shared in-memory cache of the processed files, keyed like `paths.CSV`.
+
+    Each file is loaded once (Arrow files are memory-mapped, CSVs parsed) and
+    re-read only when its mtime changes; the file is checked at most every
+    `check_interval` seconds per key. Reloads are single-flight: one thread
+    loads the new version while the others keep getting the previous one
+    (stale-while-revalidate); only a first load makes callers wait.
+
+    Frames are cast to the dataset's registered schema at load time, and
+    leagues can register an extra normalizer per key, so coercion never
+    happens on a request. Declared index columns get a GroupIndex per
+    version, built by the loader. `stats` counts hit/miss/reload/stale per key.
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str],
+        resolve: Callable[[str], Path] = published_path,
+        *,
+        check_interval: float = RELOAD_CHECK_S,
+    ):
+        self._keys = set(keys)
+        self._resolve = resolve
+        self.check_interval = check_interval
+        self._checked: Dict[str, float] = {}
+        self.stats: Dict[str, Counter] = {k: Counter() for k in self._keys}
+        self._load_locks: Dict[str, threading.Lock] = {k: threading.Lock() for k in self._keys}
+        self._normalizers: Dict[str, Normalizer] = {}
+        self._index_columns: Dict[str, Tuple[str, ...]] = {}
+        self._loaded: Dict[str, Dataset] = {}
+
+    def register(self, key: str, normalize: Normalizer) -> None:
+        if key not in self._keys:
+            raise KeyError(key)
+        self._normalizers[key] = normalize
+        # force a reload so the new normalizer is applied
+        self._loaded.pop(key, None)
+
+    def declare_indexes(self, key: str, columns: Sequence[str]) -> None:
+        if key not in self._keys:
+            raise KeyError(key)
+        self._index_columns[key] = tuple(columns)
+        self._loaded.pop(key, None)
+
+    def index_columns(self, key: str) -> Tuple[str, ...]:
+        return self._index_columns.get(key, ())
+
+    def path(self, key: str) -> Path:
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._resolve(key)
+
+    def get(self, key: str) -> Dataset:
+        """Return the current dataset for `key`; raises FileNotFoundError if the file is missing."""
+        ds = self._loaded.get(key)
+        now = time.monotonic()
+        if ds is not None and now - self._checked.get(key, float("-inf")) < self.check_interval:
+            self.stats[key]["hit"] += 1
+            return ds
+
+        path = self.path(key)
+        version = file_version(path)
+        if version is None:
+            raise FileNotFoundError(path)
+        self._checked[key] = now
+        if ds is not None and ds.path == path and ds.version == version:
+            self.stats[key]["hit"] += 1
+            return ds
+
+        lock = self._load_locks[key]
+        if ds is not None and not lock.acquire(blocking=False):
+            self.stats[key]["stale"] += 1
+            return ds  # another thread is loading the new version; serve the previous one
+        if ds is None:
+            lock.acquire()
+        try:
+            current = self._loaded.get(key)
+            if current is not None and current.path == path and current.version == version:
+                self.stats[key]["hit"] += 1
+                return current  # loaded while we waited
+            self.stats[key]["reload" if current is not None else "miss"] += 1
+            ds = self._load(key, path, version)
+            self._loaded[key] = ds
+            return ds
+        finally:
+            lock.release()
+
+    def preload(self, keys: Optional[Iterable[str]] = None) -> List[Dataset]:
+        """
+        Load every available dataset now (missing files are skipped).
+
+        Used before forking server workers so they start from the versions
+        loaded in the parent instead of each loading them at boot. Sharing is
+        only copy-on-write at the OS page level: refcount updates still dirty
+        (and so un-share) some pages, and after a refresh every worker loads
+        the new version and rebuilds its records, indexes and payloads on its
+        own, so one refresh costs N loads and N index builds. Even a load from
+        a mapped Arrow file copies the nullable-int, string and null-containing
+        columns into private memory (see read_frame).
+        """
+        out: List[Dataset] = []
+        for key in sorted(self._keys if keys is None else keys):
+            try:
+                out.append(self.get(key))
+            except FileNotFoundError:
+                continue
+        return out
+
+    def loaded(self) -> List[Dataset]:
+        """Datasets currently held in memory (no loading, no version checks)."""
+        return [ds for _, ds in sorted(self._loaded.items())]
+
+    def frame(self, key: str) -> pd.DataFrame:
+        """The shared, already-normalized frame; treat it as read-only (use masks/slices)."""
+        return self.get(key).df
+
+    def records(self, key: str) -> List[Dict[str, Any]]:
+        return self.get(key).records
+
+    def _load(self, key: str, path: Path, version: int) -> Dataset:
+        df = conform(read_frame(path), key)
+        normalize = self._normalizers.get(key)
+        if normalize is not None:
+            df = normalize(df)
+        indexes = {c: build_group_index(df, c) for c in self.index_columns(key) if c in df.columns}
+        return Dataset(key=key, path=path, version=version, df=df, indexes=indexes)
+
+
+STORE = DatasetStore(CSV)
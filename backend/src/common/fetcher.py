@@ -0,0 +1,117 @@
+# src/common/fetcher.py
+from __future__ import annotations
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, List, Optional, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: at most `rate` acquisitions per second on
+    average, with bursts of up to `burst`. Shared by all workers of a pool,
+    so the pool as a whole respects the upstream rate limit.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class PermanentError(Exception):
+    """Raised by a fetch function for failures a retry cannot fix (no backoff, no more attempts)."""
+
+
+@dataclass(frozen=True)
+class Retry:
+    """Exponential backoff with jitter: base, 2*base, 4*base, ... capped at max_delay."""
+
+    attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        return min(self.max_delay, self.base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+@dataclass
+class FetchResult(Generic[K, V]):
+    key: K
+    value: Optional[V] = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _fetch_one(key: K, fn: Callable[[K], V], bucket: Optional[TokenBucket], retry: Retry) -> FetchResult[K, V]:
+    result: FetchResult[K, V] = FetchResult(key)
+    for attempt in range(1, retry.attempts + 1):
+        if bucket is not None:
+            bucket.acquire()  # every attempt, retries included, spends a token
+        result.attempts = attempt
+        try:
+            result.value = fn(key)
+            result.error = None
+            return result
+        except Exception as e:  # upstream errors are data here, not crashes
+            result.error = e
+            if isinstance(e, PermanentError):
+                break
+            if attempt < retry.attempts:
+                time.sleep(retry.delay(attempt))
+    return result
+
+
+def fetch_all(
+    keys: Iterable[K],
+    fn: Callable[[K], V],
+    *,
+    workers: int = 4,
+    bucket: Optional[TokenBucket] = None,
+    retry: Retry = Retry(),
+    label: str = "fetch",
+    progress_every: int = 50,
+) -> List[FetchResult[K, V]]:
+    """
+    Call `fn(key)` for every key on a bounded thread pool, throttled by a
+    shared token bucket and retried with backoff. Results come back in the
+    order of `keys`; failures are returned (with their last error), not raised.
+    """
+    keys = list(keys)
+    results: List[Optional[FetchResult[K, V]]] = [None] * len(keys)
+    total = len(keys)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=label) as pool:
+        futures = {pool.submit(_fetch_one, k, fn, bucket, retry): i for i, k in enumerate(keys)}
+        for done, fut in enumerate(as_completed(futures), start=1):
+            results[futures[fut]] = fut.result()
+            if done % progress_every == 0 or done == total:
+                print(f"[{label}] fetched {done}/{total}")
+
+    return [r for r in results if r is not None]
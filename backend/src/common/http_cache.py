@@ -0,0 +1,108 @@
+# src/common/http_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.common.fetcher import PermanentError
+
+# Cache modes:
+#   on      serve responses younger than their endpoint's TTL, fetch (and record) the rest
+#   replay  offline: serve any recorded response whatever its age, never touch the network
+#   off     always fetch, record nothing
+MODES = ("on", "replay", "off")
+
+
+class ReplayMiss(PermanentError, LookupError):
+    """Replay mode was asked for a response that was never recorded."""
+
+
+def cache_key(endpoint: str, params: Iterable[Tuple[str, Any]] | Dict[str, Any]) -> str:
+    """Stable key for one request: endpoint + its params sorted by name (None == "")."""
+    items = params.items() if isinstance(params, dict) else params
+    query = "&".join(f"{k}={'' if v is None else v}" for k, v in sorted(items, key=lambda kv: kv[0]))
+    return hashlib.blake2b(f"{endpoint.lower()}?{query}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """
+    Raw upstream response bodies on disk, one file per request:
+    <root>/<endpoint>/<key>.json, whose mtime is when it was fetched.
+    Only successful responses should be stored, so failures are always retried.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        ttl_s: Dict[str, float],
+        default_ttl_s: float,
+        mode: str = "on",
+    ):
+        if mode not in MODES:
+            raise ValueError(f"cache mode must be one of {', '.join(MODES)}, not {mode!r}")
+        self.root = Path(root)
+        self.ttl_s = {k.lower(): float(v) for k, v in ttl_s.items()}
+        self.default_ttl_s = float(default_ttl_s)
+        self.mode = mode
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _path(self, endpoint: str, params) -> Path:
+        return self.root / endpoint.lower() / f"{cache_key(endpoint, params)}.json"
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def get(self, endpoint: str, params) -> Optional[str]:
+        """
+        Cached body for this request, or None if it has to be fetched.
+        In replay mode a miss raises ReplayMiss instead.
+        """
+        if self.mode == "off":
+            return None
+
+        path = self._path(endpoint, params)
+        try:
+            age = time.time() - path.stat().st_mtime
+        except FileNotFoundError:
+            if self.mode == "replay":
+                self._count("replay_miss")
+                raise ReplayMiss(f"no recorded response for {endpoint} {dict(params)}") from None
+            self._count("miss")
+            return None
+
+        if self.mode == "on" and age > self.ttl_s.get(endpoint.lower(), self.default_ttl_s):
+            self._count("stale")
+            return None
+
+        self._count("hit")
+        return path.read_text(encoding="utf-8")
+
+    def put(self, endpoint: str, params, body: str) -> None:
+        """Record a successful response (atomically; concurrent writers of one key are fine)."""
+        if self.mode != "on":
+            return
+        path = self._path(endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._count("store")
+
+    def summary(self) -> str:
+        with self._lock:
+            counts = ", ".join(f"{k}={v}" for k, v in sorted(self.stats.items())) or "no requests"
+        return f"{self.mode} ({self.root}): {counts}"
@@ -0,0 +1,186 @@
+# src/common/metrics.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask import Flask, Response, g, request
+
+from src.common.datasets import DERIVED_STATS, DatasetStore
+
+# Prometheus text exposition (format 0.0.4), no client library needed.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS: Tuple[float, ...] = (1, 10, 100, 1_000, 10_000, 100_000)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels) + "}"
+
+
+def _fmt_value(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, upper in enumerate(self.buckets):
+            if value <= upper:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """Counters and histograms keyed by (metric name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], _Histogram] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+
+    def counter(self, name: str, help_text: str) -> None:
+        self._help[name] = ("counter", help_text)
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float]) -> None:
+        self._help[name] = ("histogram", help_text)
+        self._buckets[name] = buckets
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1.0) -> None:
+        with self._lock:
+            self._counters[(name, labels)] = self._counters.get((name, labels), 0.0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        with self._lock:
+            h = self._histograms.get((name, labels))
+            if h is None:
+                h = self._histograms[(name, labels)] = _Histogram(self._buckets[name])
+            h.observe(value)
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text) in sorted(self._help.items()):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                if kind == "counter":
+                    for (n, labels), v in sorted(self._counters.items()):
+                        if n == name:
+                            lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(v)}")
+                    continue
+                for (n, labels), h in sorted(self._histograms.items(), key=lambda kv: kv[0]):
+                    if n != name:
+                        continue
+                    for upper, c in zip(h.buckets, h.counts):
+                        lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', _fmt_value(upper)),))} {c}")
+                    lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {h.count}")
+                    lines.append(f"{name}_sum{_fmt_labels(labels)} {repr(h.sum)}")
+                    lines.append(f"{name}_count{_fmt_labels(labels)} {h.count}")
+        return lines
+
+
+REGISTRY = Registry()
+REGISTRY.histogram("sap_http_request_duration_seconds", "Request latency by route.", LATENCY_BUCKETS)
+REGISTRY.histogram("sap_http_response_rows", "Rows (top-level list items) per JSON response.", SIZE_BUCKETS)
+REGISTRY.counter("sap_http_requests_total", "Requests by route and status.")
+REGISTRY.counter("sap_http_response_bytes_total", "Response body bytes sent (after compression).")
+REGISTRY.counter("sap_handled_errors_total", "Exceptions caught by a route and answered with a fallback.")
+
+
+# ---------------- request hooks ----------------
+def note_rows(n: int) -> None:
+    """Record how many rows the current response carries (called by the JSON helpers)."""
+    try:
+        g._metrics_rows = n
+    except RuntimeError:  # outside a request
+        pass
+
+
+def note_error(where: str, exc: BaseException) -> None:
+    """Log a swallowed route exception and count it."""
+    print(f"{where} error:", exc)
+    REGISTRY.inc("sap_handled_errors_total", (("route", where),))
+
+
+def _route() -> str:
+    return request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+
+
+def install(app: Flask) -> None:
+    """Time every request and count its status, bytes and rows."""
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_t0 = time.perf_counter()
+
+    @app.after_request
+    def _record(resp: Response) -> Response:
+        t0 = g.pop("_metrics_t0", None)
+        if t0 is None:
+            return resp
+        labels = (("route", _route()), ("method", request.method))
+        REGISTRY.observe("sap_http_request_duration_seconds", labels, time.perf_counter() - t0)
+        REGISTRY.inc("sap_http_requests_total", labels + (("status", str(resp.status_code)),))
+        if not resp.is_streamed and resp.content_length is not None:
+            REGISTRY.inc("sap_http_response_bytes_total", labels, resp.content_length)
+        rows: Optional[int] = g.pop("_metrics_rows", None)
+        if rows is not None:
+            REGISTRY.observe("sap_http_response_rows", labels, rows)
+        return resp
+
+
+# ---------------- exposition ----------------
+def _dataset_lines(store: DatasetStore) -> List[str]:
+    now = time.time()
+    lines = [
+        "# HELP sap_dataset_cache_total Dataset store lookups by outcome (hit, miss, reload, stale).",
+        "# TYPE sap_dataset_cache_total counter",
+    ]
+    for key in sorted(store.stats):
+        for outcome, n in sorted(store.stats[key].items()):
+            lines.append(f"sap_dataset_cache_total{_fmt_labels((('dataset', key), ('outcome', outcome)))} {n}")
+
+    lines += [
+        "# HELP sap_derived_cache_total Per-version derived artifacts by outcome (hit, build).",
+        "# TYPE sap_derived_cache_total counter",
+    ]
+    for (key, kind, outcome), n in sorted(DERIVED_STATS.items()):
+        labels = (("dataset", key), ("artifact", kind), ("outcome", outcome))
+        lines.append(f"sap_derived_cache_total{_fmt_labels(labels)} {n}")
+
+    loaded = store.loaded()
+    gauges = [
+        ("sap_dataset_version", "Loaded version (file mtime, ns since epoch).", lambda ds: ds.version),
+        ("sap_dataset_age_seconds", "Seconds since the loaded file was written.", lambda ds: now - ds.version / 1e9),
+        ("sap_dataset_loaded_timestamp_seconds", "When the loaded version was read.", lambda ds: ds.loaded_at),
+        ("sap_dataset_rows", "Rows in the loaded version.", lambda ds: len(ds.df)),
+    ]
+    for name, help_text, value in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for ds in loaded:
+            lines.append(f"{name}{_fmt_labels((('dataset', ds.key),))} {_fmt_value(value(ds))}")
+    return lines
+
+
+def render(store: DatasetStore) -> Response:
+    body = "\n".join(REGISTRY.render() + _dataset_lines(store)) + "\n"
+    return Response(body, content_type=CONTENT_TYPE)
@@ -17,3 +17,20 @@ CSV = {
     "nba_top_players": NBA_PROCESSED / "top_players.csv",
     "nba_player_game_logs": NBA_PROCESSED / "player_game_logs.csv",
 }
+
+# Columnar copies of the same datasets (Arrow IPC / Feather v2, memory-mappable).
+# Pre-snapshot layout: the API reads whichever of the two is newer.
+ARROW = {k: v.with_suffix(".arrow") for k, v in CSV.items()}
+
+# Published pipeline snapshots: SNAPSHOTS/<id>/{<key>.arrow|<key>.csv, manifest.json}.
+# CURRENT_SNAPSHOT holds the id the API serves; it is flipped atomically.
+SNAPSHOTS = DATA_ROOT / "snapshots"
+CURRENT_SNAPSHOT = SNAPSHOTS / "CURRENT"
+
+# Pipeline-side caches of raw upstream data, one immutable file per partition:
+# PARTITIONS/<name>/<part>.arrow (e.g. nba_team_game_logs/2023-24.arrow).
+PARTITIONS = DATA_ROOT / "partitions"
+
+# Recorded upstream HTTP responses (see src/common/http_cache.py), one
+# directory per API: HTTP_CACHE/<api>/<endpoint>/<key>.json.
+HTTP_CACHE = DATA_ROOT / "http_cache"
@@ -1,22 +1,235 @@
 # src/utils/response.py
-from flask import jsonify
-import pandas as pd
+from __future__ import annotations
+
+import gzip
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from flask import Response, current_app, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 import numpy as np
-from ..common.paths import CSV
+from ..common.datasets import STORE, Dataset
+from ..common.metrics import note_rows
+from ..common.serialize import dumps
+
+GZIP_MIN_BYTES = 512
+NDJSON = "application/x-ndjson"
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by serialize.dumps, so `jsonify` in every route
+    shares one encoder (orjson when installed; NaN/inf -> null, NumPy values
+    handled). Install with `app.json = FastJSONProvider(app)`.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys)).decode("utf-8")
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        if isinstance(obj, list):
+            note_rows(len(obj))
+        return self._app.response_class(dumps(obj, sort_keys=self.sort_keys) + b"\n", mimetype=self.mimetype)
+
+
+@dataclass(frozen=True)
+class JsonPayload:
+    """Serialized response body for one dataset version (plus its gzip variant)."""
+
+    etag: str
+    body: bytes
+    gzip_body: bytes | None
+    rows: int | None = None
+
+    @property
+    def gzip_etag(self) -> str:
+        return f"{self.etag}-gz"
+
+
+def build_payload(obj: Any, *, sort_keys: Optional[bool] = None) -> JsonPayload:
+    """Serialize once; `sort_keys` defaults to the app's JSON setting."""
+    if sort_keys is None:
+        sort_keys = current_app.json.sort_keys
+    body = dumps(obj, sort_keys=sort_keys) + b"\n"
+    etag = hashlib.blake2b(body, digest_size=12).hexdigest()
+    gz = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+    return JsonPayload(etag=etag, body=body, gzip_body=gz, rows=len(obj) if isinstance(obj, list) else None)
+
+
+def send_payload(payload: JsonPayload) -> Response:
+    """Send a pre-serialized payload, honoring If-None-Match and Accept-Encoding."""
+    if payload.rows is not None:
+        note_rows(payload.rows)
+    gzipped = payload.gzip_body is not None and bool(request.accept_encodings["gzip"])
+    gzip_match = payload.gzip_body is not None and request.if_none_match.contains_weak(payload.gzip_etag)
+    if gzip_match or request.if_none_match.contains_weak(payload.etag):
+        # the validator of the representation the client holds (or would get)
+        resp = Response(status=304)
+        resp.set_etag(payload.gzip_etag if gzip_match or gzipped else payload.etag)
+        resp.vary.add("Accept-Encoding")
+        return resp
+
+    if gzipped:
+        resp = Response(payload.gzip_body, mimetype="application/json")
+        resp.headers["Content-Encoding"] = "gzip"
+        resp.set_etag(payload.gzip_etag)
+    else:
+        resp = Response(payload.body, mimetype="application/json")
+        resp.set_etag(payload.etag)
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+
+def _rows_payload(ds: Dataset, name: str, rows: Callable[[], List[Dict[str, Any]]]) -> JsonPayload:
+    # cached on the dataset, so a new file version drops every variant at once
+    return ds.derived(f"json:{name}", lambda _: build_payload(rows()))
+
+
+# ---------------- list queries ----------------
+@dataclass(frozen=True)
+class ListQuery:
+    """
+    Optional list parameters shared by every csv_resp endpoint:
+      fields=A,B   project rows to these columns (in this order)
+      season=X     keep rows whose SEASON equals X (2025, "2025-26", ...)
+      <col>s=a,b   keep rows whose indexed column is any of a, b, ... (team_ids=,
+                   player_ids=, ...; one param per index declared for the dataset)
+      limit=N      page size; the next page starts at the X-Next-Cursor header
+      cursor=C     opaque cursor from a previous page (currently a row offset)
+    """
+
+    fields: Optional[List[str]] = None
+    season: Optional[str] = None
+    keys: Dict[str, List[str]] = field(default_factory=dict)
+    limit: Optional[int] = None
+    cursor: int = 0
+
+    @property
+    def is_plain(self) -> bool:
+        return (
+            self.fields is None and self.season is None and not self.keys
+            and self.limit is None and self.cursor == 0
+        )
+
+
+def key_param(column: str) -> str:
+    """Query param for multi-key lookups on an indexed column: TEAM_ID -> team_ids."""
+    return f"{column.lower()}s"
+
+
+def _int_arg(name: str, *, minimum: int) -> Optional[int]:
+    raw = request.args.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        val = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+    if val < minimum:
+        raise ValueError(f"{name} must be >= {minimum}")
+    return val
+
+
+def parse_list_query(ds: Dataset) -> ListQuery:
+    """Read ListQuery params from the current request; raises ValueError on bad input."""
+    fields = None
+    if request.args.get("fields"):
+        fields = [f.strip() for f in request.args["fields"].split(",") if f.strip()]
+        unknown = [f for f in fields if f not in ds.df.columns]
+        if unknown:
+            raise ValueError(f"unknown field(s): {', '.join(unknown)}")
+
+    season = request.args.get("season") or None
+    if season is not None and "SEASON" not in ds.df.columns:
+        raise ValueError("season filter is not supported for this dataset")
+
+    keys = {}
+    for col in STORE.index_columns(ds.key):
+        raw = request.args.get(key_param(col))
+        if raw:
+            keys[col] = [v.strip() for v in raw.split(",") if v.strip()]
+
+    return ListQuery(
+        fields=fields,
+        season=season,
+        keys=keys,
+        limit=_int_arg("limit", minimum=1),
+        cursor=_int_arg("cursor", minimum=0) or 0,
+    )
+
+
+def wants_ndjson() -> bool:
+    accept = request.accept_mimetypes
+    return accept[NDJSON] > accept["application/json"]
+
+
+def _iter_rows(ds: Dataset, idx: np.ndarray, fields: Optional[List[str]]) -> Iterator[Dict[str, Any]]:
+    records = ds.records
+    for i in idx:
+        r = records[i]
+        yield r if fields is None else {f: r[f] for f in fields}
+
+
+def send_ndjson(rows: Iterable[Dict[str, Any]], *, sort_keys: Optional[bool] = None) -> Response:
+    """Stream one JSON document per line; nothing is buffered beyond the current row."""
+    if sort_keys is None:
+        sort_keys = current_app.json.sort_keys
+
+    def generate():
+        for r in rows:
+            yield dumps(r, sort_keys=sort_keys) + b"\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON)
+
 
 def csv_resp(file_key: str, where_col=None, equals_val=None):
-    path = CSV[file_key]
-    if not path.exists():
-        return jsonify({"error": f"{path.name} not found"}), 404
+    try:
+        ds = STORE.get(file_key)
+    except FileNotFoundError:
+        return jsonify({"error": f"{STORE.path(file_key).name} not found"}), 404
 
-    df = pd.read_csv(path)
+    try:
+        q = parse_list_query(ds)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    ndjson = wants_ndjson()
 
-    df = df.replace([np.nan, np.inf, -np.inf], None)
+    # row positions (file order) selected so far; None = every row
+    idx: Optional[np.ndarray] = None
 
-    #df = df.where(pd.notnull(df), None)
+    def narrow(rows: np.ndarray) -> np.ndarray:
+        return rows if idx is None else np.intersect1d(idx, rows, assume_unique=True)
 
     if where_col and equals_val is not None:
-        df = df[df[where_col] == int(equals_val)]
-        if df.empty:
+        val = int(equals_val)
+        idx = ds.index(where_col).rows(val)
+        if not idx.size:
             return jsonify({"error": "Not found"}), 404
-    return jsonify(df.to_dict(orient="records"))
\ No newline at end of file
+        if q.is_plain and not ndjson:
+            rows = idx
+            return send_payload(_rows_payload(ds, f"{where_col}={val}", lambda: [ds.records[i] for i in rows]))
+    elif q.is_plain and not ndjson:
+        return send_payload(_rows_payload(ds, "all", lambda: ds.records))
+
+    for col, values in q.keys.items():
+        idx = narrow(ds.index(col).rows_for(values))
+    if q.season is not None:
+        idx = narrow(ds.index("SEASON").rows(q.season))
+
+    if idx is None:
+        idx = np.arange(len(ds.df))
+    stop = len(idx) if q.limit is None else min(q.cursor + q.limit, len(idx))
+    page = idx[q.cursor:stop]
+    rows = _iter_rows(ds, page, q.fields)
+    # projected rows keep the requested column order (the ETag hashes the body, so it stays stable)
+    sort_keys = False if q.fields is not None else None
+
+    if ndjson:
+        note_rows(len(page))
+    resp = send_ndjson(rows, sort_keys=sort_keys) if ndjson else send_payload(build_payload(list(rows), sort_keys=sort_keys))
+    resp.headers["X-Total-Count"] = str(len(idx))
+    if stop < len(idx):
+        resp.headers["X-Next-Cursor"] = str(stop)
+    return resp
@@ -0,0 +1,70 @@
+# src/common/schema.py
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# column -> pandas dtype name, e.g. {"PLAYER_ID": "Int32", "PTS": "Int16", "FG_PCT": "float32"}
+Schema = Dict[str, str]
+
+_INT_RANGES = {
+    "Int8": np.iinfo("int8"),
+    "Int16": np.iinfo("int16"),
+    "Int32": np.iinfo("int32"),
+    "Int64": np.iinfo("int64"),
+}
+
+_BOOL_MAP = {
+    True: True, False: False,
+    "True": True, "False": False,
+    "true": True, "false": False,
+    1: True, 0: False,
+}
+
+
+def _cast(s: pd.Series, dtype: str) -> pd.Series:
+    if str(s.dtype) == dtype:
+        return s
+
+    if dtype == "boolean":
+        return s.map(_BOOL_MAP).astype("boolean")
+
+    if dtype in _INT_RANGES:
+        num = pd.to_numeric(s, errors="coerce")
+        vals = num.dropna()
+        info = _INT_RANGES[dtype]
+        if ((vals % 1) != 0).any() or (len(vals) and (vals.min() < info.min or vals.max() > info.max)):
+            # declared as a count but the source disagrees; keep the values
+            return num.astype("float32") if ((vals % 1) != 0).any() else num.astype("Int64")
+        return num.astype(dtype)
+
+    if dtype in ("float32", "float64"):
+        return pd.to_numeric(s, errors="coerce").astype(dtype)
+
+    if dtype == "category":
+        return s.astype("category")
+
+    return s.astype(dtype)
+
+
+def apply_schema(df: pd.DataFrame, schema: Schema) -> pd.DataFrame:
+    """Cast the declared columns of `df` (others are left as-is)."""
+    out = df.copy(deep=False)  # only the cast columns are replaced
+    for col, dtype in schema.items():
+        if col in out.columns:
+            out[col] = _cast(out[col], dtype)
+    return out
+
+
+def widen_floats(values) -> np.ndarray:
+    """
+    float32 -> float64 without the binary noise (0.558f -> 0.558, not
+    0.5580000281...). Goes through the shortest float32 repr, so it is
+    only meant for once-per-version work like building JSON records.
+    """
+    arr = np.asarray(values)
+    if arr.dtype == np.float32:
+        return arr.astype(str).astype("float64")
+    return arr.astype("float64")
@@ -0,0 +1,100 @@
+# src/common/serialize.py
+from __future__ import annotations
+
+import json
+import math
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.common.schema import widen_floats
+
+try:  # optional: ~10x faster than the stdlib encoder, NaN -> null built in
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# ---------------- frames -> rows ----------------
+def column_values(s: pd.Series) -> List[Any]:
+    """One column as a list of JSON-native Python values (NA/NaN/inf -> None)."""
+    if pd.api.types.is_float_dtype(s.dtype) and not isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+        arr = widen_floats(s.to_numpy())
+        out = arr.astype(object)
+        out[~np.isfinite(arr)] = None
+        return out.tolist()
+
+    if isinstance(s.dtype, np.dtype) and s.dtype.kind in "iub":
+        return s.tolist()
+
+    if isinstance(s.dtype, np.dtype) and s.dtype.kind == "M":
+        out = s.dt.strftime("%Y-%m-%dT%H:%M:%S").to_numpy(dtype=object)
+        out[s.isna().to_numpy()] = None
+        return out.tolist()
+
+    # nullable ints/booleans, categoricals, strings, objects
+    if isinstance(s.dtype, pd.api.extensions.ExtensionDtype):
+        return s.to_numpy(dtype=object, na_value=None).tolist()
+    out = s.to_numpy(dtype=object).copy()
+    out[pd.isna(out)] = None
+    return [_native(v) for v in out.tolist()]
+
+
+def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Dataframe -> JSON-serializable records (NaN/inf/NA -> None).
+
+    Works column by column (one vectorized conversion per column) and only
+    zips the finished columns into row dicts at the end.
+    """
+    cols = [str(c) for c in df.columns]
+    values = [column_values(df.iloc[:, j]) for j in range(len(cols))]
+    return [dict(zip(cols, row)) for row in zip(*values)]
+
+
+def _native(v: Any) -> Any:
+    if isinstance(v, float) and not math.isfinite(v):
+        return None
+    if isinstance(v, np.generic):
+        return _native(v.item())
+    return v
+
+
+# ---------------- objects -> bytes ----------------
+def _default(o: Any) -> Any:
+    if o is pd.NA or o is pd.NaT:
+        return None
+    if isinstance(o, np.float32):
+        return _native(float(str(o)))  # shortest float32 repr, as orjson does
+    if isinstance(o, np.generic):
+        return _native(o.item())
+    if isinstance(o, np.ndarray):
+        return [_native(v) for v in o.tolist()]
+    if isinstance(o, (pd.Timestamp, datetime, date)):
+        return o.isoformat()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _scrub(o: Any) -> Any:
+    # stdlib fallback only: json.dumps would emit NaN/Infinity literals
+    if isinstance(o, float):
+        return o if math.isfinite(o) else None
+    if isinstance(o, dict):
+        return {k: _scrub(v) for k, v in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [_scrub(v) for v in o]
+    return o
+
+
+def dumps(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """Compact JSON bytes; NaN/inf -> null, NumPy scalars/arrays and pandas NA handled natively."""
+    if orjson is not None:
+        opts = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=opts)
+    return json.dumps(
+        _scrub(obj), default=_default, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False
+    ).encode("utf-8")
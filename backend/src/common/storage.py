@@ -0,0 +1,294 @@
+# src/common/storage.py
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from src.common.paths import ARROW, CSV, CURRENT_SNAPSHOT, PARTITIONS, SNAPSHOTS
+from src.common.schema import Schema, apply_schema
+
+try:  # optional: without pyarrow everything stays CSV
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover
+    pa = None
+    feather = None
+
+# CSV stays available as a human-readable export; set SAP_EXPORT_CSV=0 to skip it
+EXPORT_CSV = os.environ.get("SAP_EXPORT_CSV", "1") != "0"
+
+# published snapshots kept on disk (the current one included), so readers of
+# the previous version can finish before its files go away
+SNAPSHOT_KEEP = int(os.environ.get("SAP_SNAPSHOT_KEEP", "3"))
+MANIFEST = "manifest.json"
+
+# declared dtypes per dataset key; leagues register theirs (see leagues/nba/schema.py)
+_SCHEMAS: Dict[str, Schema] = {}
+
+
+def register_schema(key: str, schema: Schema) -> None:
+    if key not in CSV:
+        raise KeyError(key)
+    _SCHEMAS[key] = schema
+
+
+def conform(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Cast `df` to the schema registered for `key` (unchanged if there is none)."""
+    schema = _SCHEMAS.get(key)
+    return apply_schema(df, schema) if schema else df
+
+
+def arrow_available() -> bool:
+    return pa is not None
+
+
+def file_version(path: Path) -> Optional[int]:
+    """Version signal for a processed file (mtime in ns), None if missing."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+# ---------------- snapshots ----------------
+@dataclass
+class _Staging:
+    dir: Path
+    written: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    exports: Dict[str, pd.DataFrame] = field(default_factory=dict)
+
+
+_staging: Optional[_Staging] = None
+_pointer: Tuple[Optional[int], Optional[Path]] = (None, None)
+
+
+def current_snapshot() -> Optional[Path]:
+    """Directory of the published snapshot (None before the first publish)."""
+    global _pointer
+    version = file_version(CURRENT_SNAPSHOT)
+    if version is None:
+        return None
+    if version != _pointer[0]:
+        path = SNAPSHOTS / CURRENT_SNAPSHOT.read_text(encoding="utf-8").strip()
+        _pointer = (version, path if path.is_dir() else None)
+    return _pointer[1]
+
+
+def read_manifest(snapshot: Optional[Path] = None) -> Dict[str, Any]:
+    snapshot = snapshot or current_snapshot()
+    if snapshot is None:
+        return {}
+    try:
+        return json.loads((snapshot / MANIFEST).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def _in_snapshot(root: Path, key: str) -> Optional[Path]:
+    for suffix in ((".arrow", ".csv") if arrow_available() else (".csv",)):
+        path = root / f"{key}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def _legacy_path(key: str) -> Path:
+    # flat files next to paths.CSV: Arrow when it is at least as new as the CSV
+    csv_path = CSV[key]
+    arrow_path = ARROW[key]
+    if not arrow_available():
+        return csv_path
+
+    arrow_m = file_version(arrow_path)
+    if arrow_m is None:
+        return csv_path
+    csv_m = file_version(csv_path)
+    return arrow_path if csv_m is None or arrow_m >= csv_m else csv_path
+
+
+def published_path(key: str) -> Path:
+    """File the API serves for `key`: the published snapshot, else the flat files."""
+    root = current_snapshot()
+    path = _in_snapshot(root, key) if root is not None else None
+    return path or _legacy_path(key)
+
+
+def source_path(key: str) -> Path:
+    """
+    Like published_path, but inside publish_snapshot() a dataset already
+    written by this run is read back from the unpublished snapshot.
+    """
+    if _staging is not None:
+        path = _in_snapshot(_staging.dir, key)
+        if path is not None:
+            return path
+    return published_path(key)
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    try:
+        os.link(src, dst)  # unchanged datasets share the file with the previous snapshot
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _prune_snapshots(keep: int) -> None:
+    done = sorted(p for p in SNAPSHOTS.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for old in done[:-keep] if keep > 0 else []:
+        shutil.rmtree(old, ignore_errors=True)  # files still mapped by a reader stay valid on POSIX
+
+
+def _finish_snapshot(snap_id: str, staging: Path, written: Dict[str, Dict[str, Any]],
+                     exports: Dict[str, pd.DataFrame]) -> Path:
+    previous = read_manifest().get("datasets", {})
+    datasets: Dict[str, Dict[str, Any]] = {}
+    for key in sorted(CSV):
+        if key in written:
+            datasets[key] = {**written[key], "carried": False}
+            continue
+        # not refreshed by this run: carry the published file forward
+        src = published_path(key)
+        if file_version(src) is None:
+            continue
+        dst = staging / f"{key}{src.suffix}"
+        _link_or_copy(src, dst)
+        datasets[key] = {"file": dst.name, "rows": previous.get(key, {}).get("rows"), "carried": True}
+
+    manifest = {
+        "id": snap_id,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "datasets": datasets,
+    }
+    (staging / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    final = SNAPSHOTS / snap_id
+    os.replace(staging, final)
+    # the flip: readers move to the whole new snapshot in one step
+    _atomic_write(CURRENT_SNAPSHOT, lambda p: p.write_text(snap_id, encoding="utf-8"))
+    _prune_snapshots(SNAPSHOT_KEEP)
+
+    # CSV exports only after the flip: before the first snapshot they are what the API reads
+    for key, df in exports.items():
+        _atomic_write(CSV[key], lambda p, df=df: df.to_csv(p, index=False, encoding="utf-8"))
+    return final
+
+
+@contextmanager
+def publish_snapshot() -> Iterator[Path]:
+    """
+    Collect every write_dataset() inside the block into a new snapshot
+    directory, then publish it atomically (manifest + CURRENT flip).
+
+    Datasets not written in the block are carried over from the current
+    snapshot. If the block raises, nothing is published. Nested blocks join
+    the outer snapshot.
+    """
+    global _staging
+    if _staging is not None:
+        yield _staging.dir
+        return
+
+    snap_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    staging = SNAPSHOTS / f".{snap_id}.partial"
+    staging.mkdir(parents=True)
+    _staging = _Staging(staging)
+    try:
+        yield staging
+        written, exports = _staging.written, _staging.exports
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    finally:
+        _staging = None
+    _finish_snapshot(snap_id, staging, written, exports)
+
+
+def read_frame(path: Path) -> pd.DataFrame:
+    """
+    Read a processed file; Arrow IPC files are memory-mapped, not parsed.
+    Null-free categorical and float columns stay views of the mapped file;
+    to_pandas() copies the nullable-int, string and null-containing ones.
+    """
+    if path.suffix == ".arrow":
+        table = feather.read_table(path, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+    return pd.read_csv(path)
+
+
+def read_dataset(key: str) -> pd.DataFrame:
+    return conform(read_frame(source_path(key)), key)
+
+
+def _atomic_write(path: Path, write) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def write_dataset(df: pd.DataFrame, key: str, *, csv: Optional[bool] = None) -> None:
+    """
+    Write a processed dataset into the snapshot being built: Arrow IPC
+    (uncompressed, so readers can mmap it), or CSV without pyarrow. The frame
+    is cast to the registered schema first. Outside publish_snapshot() the
+    write is published on its own as a one-dataset snapshot.
+
+    A human-readable CSV export is also refreshed at paths.CSV (after the
+    snapshot is published) unless SAP_EXPORT_CSV=0; the API does not read
+    it once a snapshot exists.
+    """
+    if _staging is None:
+        with publish_snapshot():
+            write_dataset(df, key, csv=csv)
+        return
+
+    df = conform(df, key)
+    if arrow_available():
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        path = _staging.dir / f"{key}.arrow"
+        feather.write_feather(table, path, compression="uncompressed")
+    else:
+        path = _staging.dir / f"{key}.csv"
+        df.to_csv(path, index=False, encoding="utf-8")
+    _staging.written[key] = {"file": path.name, "rows": int(len(df))}
+
+    if EXPORT_CSV if csv is None else csv:
+        _staging.exports[key] = df
+
+
+# ---------------- partitions ----------------
+# Pipeline-side caches of raw upstream data, one file per partition (e.g. one
+# finished season). They are inputs to the pipeline, not served by the API,
+# so they live outside the snapshots and are written only once per partition.
+def partition_path(name: str, part: str) -> Optional[Path]:
+    """Existing file for PARTITIONS/<name>/<part>.arrow (or .csv), None if not cached."""
+    for suffix in (".arrow", ".csv"):
+        path = PARTITIONS / name / f"{part}{suffix}"
+        if path.exists() and (suffix == ".csv" or arrow_available()):
+            return path
+    return None
+
+
+def read_partition(name: str, part: str) -> Optional[pd.DataFrame]:
+    path = partition_path(name, part)
+    return None if path is None else read_frame(path)
+
+
+def write_partition(df: pd.DataFrame, name: str, part: str) -> Path:
+    """Atomically write one partition (Arrow IPC, or CSV without pyarrow)."""
+    if arrow_available():
+        path = PARTITIONS / name / f"{part}.arrow"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        _atomic_write(path, lambda p: feather.write_feather(table, p, compression="uncompressed"))
+    else:
+        path = PARTITIONS / name / f"{part}.csv"
+        _atomic_write(path, lambda p: df.to_csv(p, index=False, encoding="utf-8"))
+    return path
@@ -0,0 +1,99 @@
+# src/leagues/nba/api/nba_game_logs.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.common.datasets import STORE, Dataset, to_records
+
+
+@dataclass
+class PlayerLogIndex:
+    """
+    player_game_logs.csv grouped by player, newest game first.
+
+    Rows for one player are contiguous in `records`; `spans` maps
+    PLAYER_ID -> (start, stop). Filter columns are kept as arrays aligned
+    with `records` so a request is a slice plus an optional mask.
+    """
+
+    records: List[Dict[str, Any]]
+    spans: Dict[int, Tuple[int, int]]
+    opp: Optional[np.ndarray]
+    is_home: Optional[np.ndarray]
+    is_away: Optional[np.ndarray]
+
+
+def _build_index(ds: Dataset) -> PlayerLogIndex:
+    if "PLAYER_ID" not in ds.df.columns:
+        raise ValueError("invalid game logs schema")
+
+    df = ds.df.copy(deep=False)  # copy-on-write: column writes below never reach the cache
+    df["PLAYER_ID"] = pd.to_numeric(df["PLAYER_ID"], errors="coerce")
+    df = df.dropna(subset=["PLAYER_ID"])
+
+    if "OPP_TEAM_ABBR" in df.columns:
+        df["OPP_TEAM_ABBR"] = df["OPP_TEAM_ABBR"].str.upper()  # NA stays NA (not "NAN")
+
+    # Sort by player, newest first within each player
+    sort_cols = ["PLAYER_ID"]
+    if "GAME_DATE" in df.columns:
+        df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], errors="coerce")
+        sort_cols.append("GAME_DATE")
+        if "GAME_ID" in df.columns:
+            sort_cols.append("GAME_ID")
+    df = df.sort_values(sort_cols, ascending=[True] + [False] * (len(sort_cols) - 1), kind="mergesort")
+
+    if "GAME_DATE" in df.columns:
+        # Convert back to ISO string for frontend
+        df["GAME_DATE"] = df["GAME_DATE"].dt.strftime("%Y-%m-%d")
+
+    ids = df["PLAYER_ID"].to_numpy(dtype="int64")
+    uniq, starts, counts = np.unique(ids, return_index=True, return_counts=True)
+    spans = {int(p): (int(s), int(s + n)) for p, s, n in zip(uniq, starts, counts)}
+
+    def _flag(col: str) -> Optional[np.ndarray]:
+        return (df[col] == True).fillna(False).to_numpy(dtype=bool) if col in df.columns else None
+
+    return PlayerLogIndex(
+        records=to_records(df),
+        spans=spans,
+        opp=df["OPP_TEAM_ABBR"].to_numpy() if "OPP_TEAM_ABBR" in df.columns else None,
+        is_home=_flag("IS_HOME"),
+        is_away=_flag("IS_AWAY"),
+    )
+
+
+def load_player_log_index() -> PlayerLogIndex:
+    """Index for the current player_game_logs.csv; rebuilt only when the file changes."""
+    return STORE.get("nba_player_game_logs").derived("player_index", _build_index)
+
+
+def get_player_gamelog(
+    player_id: int,
+    *,
+    last_n: int = 5,
+    opp: str | None = None,
+    home: bool | None = None,
+    away: bool | None = None,
+) -> List[Dict[str, Any]]:
+    idx = load_player_log_index()
+    span = idx.spans.get(int(player_id))
+    if span is None:
+        return []
+    start, stop = span
+
+    mask = np.ones(stop - start, dtype=bool)
+    if opp and idx.opp is not None:
+        mask &= idx.opp[start:stop] == opp
+    if home is True and idx.is_home is not None:
+        mask &= idx.is_home[start:stop]
+    if away is True and idx.is_away is not None:
+        mask &= idx.is_away[start:stop]
+
+    if mask.all():
+        return idx.records[start:min(stop, start + last_n)]
+    return [idx.records[start + i] for i in np.flatnonzero(mask)[:last_n]]
@@ -0,0 +1,205 @@
+# src/leagues/nba/api/nba_leader_exprs.py
+"""
+Small expression language for leaderboards.
+
+  expr   := term (("+" | "-") term)*
+  term   := unary (("*" | "/") unary)*
+  unary  := "-" unary | atom
+  atom   := NUMBER | NAME | NAME "(" expr ("," expr)* ")" | "(" expr ")"
+
+NAME is a roster_master column (GP, PTS, FGA, ...) or a macro below.
+Division is always safe: x / 0 -> NaN, so nothing ranks as +inf.
+
+Functions:
+  DIV(a, b)       safe divide (same as a / b)
+  TOT(x)          season total from a per-game column (x * GP)
+  PER36(x)        per-36-minutes rate (x / MIN * 36)
+  PCT_TOT(m, a)   totals-based percentage (TOT(m) / TOT(a))
+
+Expressions are compiled once (cached by source string) into a tree of
+NumPy closures, so evaluating one over the stat matrix is a handful of
+vectorized array ops.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Protocol, Tuple
+
+import numpy as np
+
+
+class ColumnSource(Protocol):
+    n: int
+
+    def col(self, name: str) -> np.ndarray: ...
+
+
+Evaluator = Callable[[ColumnSource], np.ndarray]
+
+MACROS: Dict[str, str] = {
+    "FG_PCT_TOT": "PCT_TOT(FGM, FGA)",
+    "FG3_PCT_TOT": "PCT_TOT(FG3M, FG3A)",
+    "FT_PCT_TOT": "PCT_TOT(FTM, FTA)",
+    "TSA_TOT": "TOT(FGA) + 0.44 * TOT(FTA)",
+}
+
+_TOKEN_RE = re.compile(r"\s*(?:(?P<num>\d+(?:\.\d*)?|\.\d+)|(?P<name>[A-Za-z_][A-Za-z0-9_]*)|(?P<op>[-+*/(),]))")
+
+
+def _safe_div(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.true_divide(a, b)
+    return np.where(b == 0, np.nan, out)
+
+
+_FUNCS: Dict[str, Tuple[int, Callable[..., Evaluator]]] = {
+    "DIV": (2, lambda a, b: lambda m: _safe_div(a(m), b(m))),
+    "TOT": (1, lambda x: lambda m: x(m) * m.col("GP")),
+    "PER36": (1, lambda x: lambda m: _safe_div(x(m), m.col("MIN")) * 36.0),
+    "PCT_TOT": (2, lambda a, b: lambda m: _safe_div(a(m) * m.col("GP"), b(m) * m.col("GP"))),
+}
+
+_BINOPS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": _safe_div,
+}
+
+
+@dataclass(frozen=True)
+class CompiledExpr:
+    source: str
+    columns: FrozenSet[str]
+    fn: Evaluator
+
+    def evaluate(self, m: ColumnSource) -> np.ndarray:
+        out = self.fn(m)
+        if np.ndim(out) == 0:
+            out = np.full(m.n, float(out))
+        return out
+
+
+def _tokenize(src: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    pos = 0
+    src = src.rstrip()
+    while pos < len(src):
+        m = _TOKEN_RE.match(src, pos)
+        if m is None:
+            raise ValueError(f"unexpected character {src[pos:].strip()[:1]!r} in expression {src!r}")
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind)))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, src: str, stack: Tuple[str, ...]):
+        self.src = src
+        self.tokens = _tokenize(src)
+        self.pos = 0
+        self.columns: set[str] = set()
+        self.stack = stack
+
+    def _peek(self) -> Tuple[str, str] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self, value: str | None = None) -> Tuple[str, str]:
+        tok = self._peek()
+        if tok is None or (value is not None and tok[1] != value):
+            want = repr(value) if value else "a value"
+            raise ValueError(f"expected {want} in expression {self.src!r}")
+        self.pos += 1
+        return tok
+
+    def parse(self) -> Evaluator:
+        fn = self._expr()
+        if self._peek() is not None:
+            raise ValueError(f"unexpected {self._peek()[1]!r} in expression {self.src!r}")
+        return fn
+
+    def _binary(self, ops: str, operand: Callable[[], Evaluator]) -> Evaluator:
+        left = operand()
+        while (tok := self._peek()) is not None and tok[0] == "op" and tok[1] in ops:
+            self.pos += 1
+            right = operand()
+            left = (lambda f, a, b: lambda m: f(a(m), b(m)))(_BINOPS[tok[1]], left, right)
+        return left
+
+    def _expr(self) -> Evaluator:
+        return self._binary("+-", self._term)
+
+    def _term(self) -> Evaluator:
+        return self._binary("*/", self._unary)
+
+    def _unary(self) -> Evaluator:
+        tok = self._peek()
+        if tok == ("op", "-"):
+            self.pos += 1
+            inner = self._unary()
+            return lambda m: -inner(m)
+        return self._atom()
+
+    def _atom(self) -> Evaluator:
+        kind, value = self._take()
+
+        if kind == "num":
+            x = float(value)
+            return lambda m: np.float64(x)
+
+        if kind == "op":
+            if value != "(":
+                raise ValueError(f"unexpected {value!r} in expression {self.src!r}")
+            inner = self._expr()
+            self._take(")")
+            return inner
+
+        name = value.upper()
+        if self._peek() == ("op", "("):
+            return self._call(name)
+
+        if name in MACROS:
+            if name in self.stack:
+                raise ValueError(f"recursive macro {name!r}")
+            macro = _compile(MACROS[name], self.stack + (name,))
+            self.columns |= macro.columns
+            return macro.fn
+
+        self.columns.add(name)
+        return lambda m: m.col(name)
+
+    def _call(self, name: str) -> Evaluator:
+        if name not in _FUNCS:
+            raise ValueError(f"unknown function {name!r} in expression {self.src!r}")
+        arity, make = _FUNCS[name]
+
+        self._take("(")
+        args = [self._expr()]
+        while self._peek() == ("op", ","):
+            self.pos += 1
+            args.append(self._expr())
+        self._take(")")
+
+        if len(args) != arity:
+            raise ValueError(f"{name} takes {arity} argument(s), got {len(args)}")
+        if name in ("TOT", "PER36", "PCT_TOT"):
+            self.columns.add("GP" if name != "PER36" else "MIN")
+        return make(*args)
+
+
+def _compile(src: str, stack: Tuple[str, ...] = ()) -> CompiledExpr:
+    p = _Parser(src, stack)
+    fn = p.parse()
+    return CompiledExpr(source=src, columns=frozenset(p.columns), fn=fn)
+
+
+@lru_cache(maxsize=256)
+def compile_expr(src: str) -> CompiledExpr:
+    """Parse + compile a leader expression (cached by source string)."""
+    src = (src or "").strip()
+    if not src:
+        raise ValueError("empty expression")
+    return _compile(src)
@@ -1,28 +1,137 @@
 # src/utils/nba_leaders.py
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from src.leagues.nba.api.nba_data import load_master_roster_df
+from src.common.datasets import Dataset
+from src.common.schema import widen_floats
+from src.leagues.nba.api.nba_data import master_roster_dataset
+from src.leagues.nba.api.nba_leader_exprs import compile_expr
+
+# ---------------- payload cache ----------------
+# (min_gp, limit, roster_master version, custom cards) -> payload, LRU-evicted.
+# Payloads with custom (expr=) cards get their own smaller LRU, so a burst of
+# ad-hoc queries cannot evict the warmed standard leaderboards.
+_PAYLOAD_CACHE: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_PAYLOAD_CACHE_SIZE = 32
+_CUSTOM_PAYLOAD_CACHE: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_CUSTOM_PAYLOAD_CACHE_SIZE = 16
+_PAYLOAD_LOCK = threading.Lock()  # guards both caches
+
+# (min_gp, limit) combos the StatLeadersTab requests; built as soon as a roster version loads
+WARM_DEFAULTS: List[Tuple[int, int]] = [(10, 5), (5, 5), (20, 5)]
+
+# ---------------- stat matrix ----------------
+_EXPR_CACHE_SIZE = 256
+
+LEADER_STAT_COLS = [
+    "GP", "MIN",
+    "PTS", "REB", "AST", "STL", "BLK", "TOV",
+    "OREB", "DREB",
+    "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA",
+    "FG_PCT", "FG3_PCT", "FT_PCT", "TS_PCT",
+]
+
+
+@dataclass
+class LeaderMatrix:
+    """
+    Roster stats coerced once per roster_master version.
+
+    `values` is one float64 matrix (players x stat columns); expression results
+    (see nba_leader_exprs) are cached as extra columns in `_exprs` so every
+    option is evaluated once per version, not once per request.
+    """
+
+    cols: Dict[str, int]
+    values: np.ndarray
+    player_id: List[Optional[int]]
+    name: List[Any]
+    team_id: List[Optional[int]]
+    team_abbr: List[Any]
+    gp: np.ndarray
+    qualified: np.ndarray
+    _exprs: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def n(self) -> int:
+        return self.values.shape[0]
+
+    def col(self, name: str) -> np.ndarray:
+        j = self.cols.get(name)
+        if j is None:
+            return np.full(self.n, np.nan)
+        return self.values[:, j]
+
+    def expr(self, expr: str) -> np.ndarray:
+        out = self._exprs.get(expr)
+        if out is None:
+            out = compile_expr(expr).evaluate(self)
+            if len(self._exprs) < _EXPR_CACHE_SIZE:
+                self._exprs[expr] = out
+        return out
+
+
+def _id_list(df: pd.DataFrame, col: str, cast=None) -> List[Any]:
+    if col not in df.columns:
+        return [None] * len(df)
+    return [None if pd.isna(v) else (cast(v) if cast else v) for v in df[col].tolist()]
+
+
+def _build_matrix(ds: Dataset) -> LeaderMatrix:
+    df = ds.df
+
+    stat_cols = [c for c in LEADER_STAT_COLS if c in df.columns]
+    stat_cols += [
+        c for c in df.columns
+        if c not in stat_cols and pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])
+    ]
+    values = np.empty((len(df), len(stat_cols)), dtype="float64")
+    for j, c in enumerate(stat_cols):
+        col = pd.to_numeric(df[c], errors="coerce")
+        # float32 columns are widened via their shortest repr so 0.558 stays 0.558
+        raw = col.to_numpy() if col.dtype == np.float32 else col.to_numpy(dtype="float64", na_value=np.nan)
+        values[:, j] = widen_floats(raw)
+
+    cols = {c: j for j, c in enumerate(stat_cols)}
+    gp = values[:, cols["GP"]] if "GP" in cols else np.full(len(df), np.nan)
+
+    return LeaderMatrix(
+        cols=cols,
+        values=values,
+        player_id=_id_list(df, "PLAYER_ID", int),
+        name=_id_list(df, "PLAYER_NAME"),
+        team_id=_id_list(df, "TEAM_ID", int),
+        team_abbr=_id_list(df, "TEAM_ABBREVIATION"),
+        gp=gp,
+        qualified=_qualifier_mask(df, gp, qualify_pct=0.70),
+    )
+
+
+def load_leader_matrix(ds: Optional[Dataset] = None) -> LeaderMatrix:
+    ds = ds or master_roster_dataset()
+    return ds.derived("leaders_matrix", _build_matrix)
 
-import math
 
 # ---------------- qualifiers ----------------
-def _apply_qualifiers(df: pd.DataFrame, *, qualify_pct: float = 0.70) -> pd.DataFrame:
+def _qualifier_mask(df: pd.DataFrame, gp: np.ndarray, *, qualify_pct: float = 0.70) -> np.ndarray:
     """
     ESPN-style qualifier: player must play >= qualify_pct of his team's games.
     Uses team games played to date approximated by max player GP on that team.
     """
     if "TEAM_ID" not in df.columns or "GP" not in df.columns:
-        return df
+        return np.ones(len(df), dtype=bool)
 
-    team_games = df.groupby("TEAM_ID")["GP"].max().to_dict()
-    req = df["TEAM_ID"].map(team_games).fillna(0) * qualify_pct
-    req = req.apply(lambda x: math.ceil(x))
+    team_games = pd.Series(gp, index=df.index).groupby(df["TEAM_ID"]).max()
+    req = df["TEAM_ID"].map(team_games).fillna(0).to_numpy(dtype="float64") * qualify_pct
 
-    return df[df["GP"].fillna(0) >= req]
+    return np.nan_to_num(gp, nan=0.0) >= np.ceil(req)
 
 # ---------------- formatting ----------------
 def _fmt(v: Any, fmt: str) -> Optional[float]:
@@ -40,53 +149,30 @@ def _fmt(v: Any, fmt: str) -> Optional[float]:
         return float(int(round(x)))
     return round(x, 1)
 
-# ---------------- helper: totals ----------------
-def _tot(df: pd.DataFrame, col: str) -> pd.Series:
-    return pd.to_numeric(df.get(col), errors="coerce") * pd.to_numeric(df.get("GP"), errors="coerce")
-
 # ---------------- leader computation ----------------
-def _compute_series(df: pd.DataFrame, expr: str) -> pd.Series:
+def _top_k(values: np.ndarray, mask: np.ndarray, k: int) -> np.ndarray:
     """
-    Supported expressions:
-      - "COL" (use per-game column)
-      - "COL*GP" (totals derived from per-game)
-      - "DIV(A,B)" (safe divide)
-      - "FG_PCT_TOT" = (FGM*GP)/(FGA*GP)
-      - "FG3_PCT_TOT" = (FG3M*GP)/(FG3A*GP)
-      - "FT_PCT_TOT" = (FTM*GP)/(FTA*GP)
+    Row indices of the k largest non-NaN values under `mask`, best first.
+    argpartition keeps this O(n); ties are broken by row order.
     """
-    expr = expr.strip()
-
-    if expr.endswith("*GP"):
-        col = expr[:-3]
-        return pd.to_numeric(df.get(col), errors="coerce") * pd.to_numeric(df.get("GP"), errors="coerce")
-
-    if expr == "FG_PCT_TOT":
-        fgm = pd.to_numeric(df.get("FGM"), errors="coerce") * pd.to_numeric(df.get("GP"), errors="coerce")
-        fga = pd.to_numeric(df.get("FGA"), errors="coerce") * pd.to_numeric(df.get("GP"), errors="coerce")
-        return fgm / fga
+    cand = np.flatnonzero(mask & ~np.isnan(values))
+    if cand.size == 0:
+        return cand
 
-    if expr == "FG3_PCT_TOT":
-        m = pd.to_numeric(df.get("FG3M"), errors="coerce") * pd.to_numeric(df.get("GP"), errors="coerce")
-        a = pd.to_numeric(df.get("FG3A"), errors="coerce") * pd.to_numeric(df.get("GP"), errors="coerce")
-        return m / a
+    v = values[cand]
+    if cand.size > k:
+        kth = v[np.argpartition(-v, k - 1)[k - 1]]
+        above = cand[v > kth]
+        ties = cand[v == kth][: k - above.size]
+        cand = np.concatenate([above, ties])
+        v = values[cand]
 
-    if expr == "FT_PCT_TOT":
-        m = pd.to_numeric(df.get("FTM"), errors="coerce") * pd.to_numeric(df.get("GP"), errors="coerce")
-        a = pd.to_numeric(df.get("FTA"), errors="coerce") * pd.to_numeric(df.get("GP"), errors="coerce")
-        return m / a
-    
-    if expr == "TSA_TOT":
-        fga = _tot(df, "FGA")
-        fta = _tot(df, "FTA")
-        return fga + 0.44 * fta
-
-    # simple column
-    return pd.to_numeric(df.get(expr), errors="coerce")
+    return cand[np.lexsort((cand, -v))]
 
 
 def _leaderboard_from_expr(
-    df: pd.DataFrame,
+    m: LeaderMatrix,
+    mask: np.ndarray,
     *,
     expr: str,
     fmt: str,
@@ -94,36 +180,25 @@ def _leaderboard_from_expr(
     attempts_expr: str | None = None,
     min_attempts: float = 0,
 ) -> Dict[str, Any]:
-    id_cols = ["PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION", "GP"]
-    use = df[[c for c in id_cols if c in df.columns]].copy()
-
-    # ensure required fields exist
-    for c in id_cols:
-        if c not in use.columns:
-            use[c] = None
-
-    values = _compute_series(df, expr)
-    use["VALUE"] = values
+    values = m.expr(expr)
 
     if attempts_expr:
-        use["ATT"] = _compute_series(df, attempts_expr)
-        use = use.dropna(subset=["ATT"])
-        use = use[use["ATT"] > min_attempts]
-
-    use = use.dropna(subset=["VALUE"])
-    use = use.sort_values("VALUE", ascending=False).head(max(1, limit))
+        att = m.expr(attempts_expr)
+        with np.errstate(invalid="ignore"):
+            mask = mask & (att > min_attempts)
 
     top: List[Dict[str, Any]] = []
-    for i, row in enumerate(use.itertuples(index=False), start=1):
+    for rank, i in enumerate(_top_k(values, mask, max(1, limit)), start=1):
+        gp = m.gp[i]
         top.append(
             {
-                "rank": i,
-                "playerId": int(row.PLAYER_ID) if row.PLAYER_ID is not None else None,
-                "name": row.PLAYER_NAME,
-                "teamId": int(row.TEAM_ID) if row.TEAM_ID is not None else None,
-                "teamAbbr": row.TEAM_ABBREVIATION,
-                "value": _fmt(row.VALUE, fmt),
-                "gp": float(row.GP) if row.GP is not None else None,
+                "rank": rank,
+                "playerId": m.player_id[i],
+                "name": m.name[i],
+                "teamId": m.team_id[i],
+                "teamAbbr": m.team_abbr[i],
+                "value": _fmt(values[i], fmt),
+                "gp": None if np.isnan(gp) else float(gp),
             }
         )
 
@@ -136,7 +211,8 @@ def _card(
     title: str,
     options: List[Dict[str, Any]],
     default_option_key: str,
-    df: pd.DataFrame,
+    m: LeaderMatrix,
+    mask: np.ndarray,
     limit: int,
 ) -> Dict[str, Any]:
     leaders_by_option: Dict[str, Any] = {}
@@ -146,7 +222,8 @@ def _card(
         expr = opt["expr"]
         fmt = opt["format"]
         leaders_by_option[opt_key] = _leaderboard_from_expr(
-            df,
+            m,
+            mask,
             expr=expr,
             fmt=fmt,
             limit=limit,
@@ -163,167 +240,227 @@ def _card(
     }
 
 
-# ---------------- public API ----------------
-def get_leaders_payload(*, min_gp: int = 10, limit: int = 5) -> Dict[str, Any]:
-    limit = max(1, min(int(limit), 25))
-    min_gp = max(0, min(int(min_gp), 82))
+# ---------------- card definitions ----------------
+# Each option's "expr" (and optional "attemptsExpr") is a nba_leader_exprs expression.
+LEADER_CARDS: List[Dict[str, Any]] = [
+    {
+        "key": "points",
+        "title": "Points",
+        "default": "ppg",
+        "options": [
+            {"key": "ppg", "label": "PPG", "expr": "PTS", "format": "1dp"},
+            {"key": "total", "label": "Total", "expr": "TOT(PTS)", "format": "0dp"},
+        ],
+    },
+    {
+        "key": "assists",
+        "title": "Assists",
+        "default": "apg",
+        "options": [
+            {"key": "apg", "label": "APG", "expr": "AST", "format": "1dp"},
+            {"key": "total", "label": "Total", "expr": "TOT(AST)", "format": "0dp"},
+        ],
+    },
+    # Rebounds (includes splits)
+    {
+        "key": "rebounds",
+        "title": "Rebounds",
+        "default": "trb_pg",
+        "options": [
+            {"key": "trb_pg", "label": "TRB/G", "expr": "REB", "format": "1dp"},
+            {"key": "trb_total", "label": "TRB", "expr": "TOT(REB)", "format": "0dp"},
+            {"key": "oreb_pg", "label": "OREB/G", "expr": "OREB", "format": "1dp"},
+            {"key": "dreb_pg", "label": "DREB/G", "expr": "DREB", "format": "1dp"},
+        ],
+    },
+    # Shooting (FG makes + FG% + TS% + FT)
+    {
+        "key": "shooting",
+        "title": "Shooting",
+        "default": "fgm_pg",
+        "options": [
+            {"key": "fg_pct", "label": "FG%", "expr": "FG_PCT_TOT", "format": "pct",
+             "attemptsExpr": "TOT(FGA)", "minAttempts": 200},
+            {"key": "fgm_total", "label": "FGM", "expr": "TOT(FGM)", "format": "0dp"},
+            {"key": "fgm_pg", "label": "FGM/G", "expr": "FGM", "format": "1dp"},
+            {"key": "ts_pct", "label": "TS%", "expr": "TS_PCT", "format": "pct",
+             "attemptsExpr": "TSA_TOT", "minAttempts": 200},
+            {"key": "ft_pct", "label": "FT%", "expr": "FT_PCT_TOT", "format": "pct",
+             "attemptsExpr": "TOT(FTA)", "minAttempts": 50},
+            {"key": "ftm_pg", "label": "FTM/G", "expr": "FTM", "format": "1dp"},
+            {"key": "ftm_total", "label": "FTM", "expr": "TOT(FTM)", "format": "0dp"},
+        ],
+    },
+    {
+        "key": "threept",
+        "title": "3PT",
+        "default": "made_pg",
+        "options": [
+            {"key": "made_pg", "label": "3PM/G", "expr": "FG3M", "format": "1dp"},
+            {"key": "made_total", "label": "3PM", "expr": "TOT(FG3M)", "format": "0dp"},
+            {"key": "pct", "label": "3P%", "expr": "FG3_PCT_TOT", "format": "pct",
+             "attemptsExpr": "TOT(FG3A)", "minAttempts": 75},
+        ],
+    },
+    {
+        "key": "minutes",
+        "title": "Minutes",
+        "default": "mpg",
+        "options": [
+            {"key": "mpg", "label": "MPG", "expr": "MIN", "format": "1dp"},
+            {"key": "total", "label": "Total", "expr": "TOT(MIN)", "format": "0dp"},
+        ],
+    },
+    # Defense
+    {
+        "key": "steals",
+        "title": "Steals",
+        "default": "spg",
+        "options": [
+            {"key": "spg", "label": "SPG", "expr": "STL", "format": "1dp"},
+            {"key": "total", "label": "Total", "expr": "TOT(STL)", "format": "0dp"},
+        ],
+    },
+    {
+        "key": "blocks",
+        "title": "Blocks",
+        "default": "bpg",
+        "options": [
+            {"key": "bpg", "label": "BPG", "expr": "BLK", "format": "1dp"},
+            {"key": "total", "label": "Total", "expr": "TOT(BLK)", "format": "0dp"},
+        ],
+    },
+    {
+        "key": "turnovers",
+        "title": "Turnovers",
+        "default": "tpg",
+        "options": [
+            {"key": "tpg", "label": "TOV/G", "expr": "TOV", "format": "1dp"},
+            {"key": "total", "label": "Total", "expr": "TOT(TOV)", "format": "0dp"},
+        ],
+    },
+]
+
+FORMATS = ("1dp", "0dp", "pct")
+
+
+def custom_card(
+    expr: str,
+    *,
+    label: Optional[str] = None,
+    fmt: str = "1dp",
+    attempts_expr: Optional[str] = None,
+    min_attempts: float = 0,
+) -> Dict[str, Any]:
+    """Card definition for a leaderboard requested through query params."""
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
 
-    df = load_master_roster_df()
-    df = _apply_qualifiers(df, qualify_pct=0.70)
+    option: Dict[str, Any] = {"key": "custom", "label": label or expr, "expr": expr, "format": fmt}
+    if attempts_expr:
+        option["attemptsExpr"] = attempts_expr
+        option["minAttempts"] = float(min_attempts)
+    return {"key": "custom", "title": label or "Custom", "default": "custom", "options": [option]}
 
-    # basic filter
-    if "GP" in df.columns:
-        df = df[df["GP"].fillna(0) >= min_gp]
 
-    cards: List[Dict[str, Any]] = []
+def _check_exprs(m: LeaderMatrix, card: Dict[str, Any]) -> None:
+    for opt in card["options"]:
+        for expr in (opt["expr"], opt.get("attemptsExpr")):
+            if not expr:
+                continue
+            missing = sorted(c for c in compile_expr(expr).columns if c not in m.cols)
+            if missing:
+                raise ValueError(f"unknown column(s) {', '.join(missing)} in expression {expr!r}")
 
-    # Points
-    cards.append(
-        _card(
-            card_key="points",
-            title="Points",
-            default_option_key="ppg",
-            options=[
-                {"key": "ppg", "label": "PPG", "expr": "PTS", "format": "1dp"},
-                {"key": "total", "label": "Total", "expr": "PTS*GP", "format": "0dp"},
-            ],
-            df=df,
-            limit=limit,
-        )
-    )
 
-    # Assists
-    cards.append(
-        _card(
-            card_key="assists",
-            title="Assists",
-            default_option_key="apg",
-            options=[
-                {"key": "apg", "label": "APG", "expr": "AST", "format": "1dp"},
-                {"key": "total", "label": "Total", "expr": "AST*GP", "format": "0dp"},
-            ],
-            df=df,
-            limit=limit,
-        )
-    )
+def _build_payload(
+    m: LeaderMatrix,
+    *,
+    min_gp: int,
+    limit: int,
+    extra_cards: Tuple[Dict[str, Any], ...] = (),
+) -> Dict[str, Any]:
+    # qualifiers + basic filter, as one row mask over the matrix
+    mask = m.qualified & (np.nan_to_num(m.gp, nan=0.0) >= min_gp)
 
-    # Rebounds (includes splits)
-    cards.append(
+    for card in extra_cards:
+        _check_exprs(m, card)
+
+    cards = [
         _card(
-            card_key="rebounds",
-            title="Rebounds",
-            default_option_key="trb_pg",
-            options=[
-                {"key": "trb_pg", "label": "TRB/G", "expr": "REB", "format": "1dp"},
-                {"key": "trb_total", "label": "TRB", "expr": "REB*GP", "format": "0dp"},
-                {"key": "oreb_pg", "label": "OREB/G", "expr": "OREB", "format": "1dp"},
-                {"key": "dreb_pg", "label": "DREB/G", "expr": "DREB", "format": "1dp"},
-            ],
-            df=df,
+            card_key=card["key"],
+            title=card["title"],
+            default_option_key=card["default"],
+            options=card["options"],
+            m=m,
+            mask=mask,
             limit=limit,
         )
-    )
+        for card in [*LEADER_CARDS, *extra_cards]
+    ]
 
-    # Shooting (FG makes + FG% + TS% + FT)
-    cards.append(
-        _card(
-            card_key="shooting",
-            title="Shooting",
-            default_option_key="fgm_pg",
-            options=[
-                {"key":"fg_pct","label":"FG%","expr":"FG_PCT_TOT","format":"pct",
-                "attemptsExpr":"FGA*GP","minAttempts": 200},
-                {"key":"fgm_total","label":"FGM","expr":"FGM*GP","format":"0dp"},
-                {"key":"fgm_pg","label":"FGM/G","expr":"FGM","format":"1dp"},
-
-                {"key":"ts_pct","label":"TS%","expr":"TS_PCT","format":"pct",
-                "attemptsExpr":"TSA_TOT","minAttempts": 200},
-
-                # NEW: Free throws inside shooting
-                {"key":"ft_pct","label":"FT%","expr":"FT_PCT_TOT","format":"pct",
-                "attemptsExpr":"FTA*GP","minAttempts": 50},
-
-                {"key":"ftm_pg","label":"FTM/G","expr":"FTM","format":"1dp"},
-                {"key":"ftm_total","label":"FTM","expr":"FTM*GP","format":"0dp"},
-            ],
-            df=df,
-            limit=limit
-        )
-    )
+    return {"minGp": min_gp, "limit": limit, "cards": cards}
 
-    # 3PT
-    cards.append(
-        _card(
-            card_key="threept",
-            title="3PT",
-            default_option_key="made_pg",
-            options=[
-                {"key":"made_pg","label":"3PM/G","expr":"FG3M","format":"1dp"},
-                {"key":"made_total","label":"3PM","expr":"FG3M*GP","format":"0dp"},
-                {"key":"pct","label":"3P%","expr":"FG3_PCT_TOT","format":"pct",
-                "attemptsExpr":"FG3A*GP","minAttempts": 75},   # >0 attempts filter
-            ],
-            df=df,
-            limit=limit
-        )
-    )
 
-    # Minutes
-    cards.append(
-        _card(
-            card_key="minutes",
-            title="Minutes",
-            default_option_key="mpg",
-            options=[
-                {"key": "mpg", "label": "MPG", "expr": "MIN", "format": "1dp"},
-                {"key": "total", "label": "Total", "expr": "MIN*GP", "format": "0dp"},
-            ],
-            df=df,
-            limit=limit,
-        )
-    )
+def _normalize_args(min_gp: int, limit: int) -> Tuple[int, int]:
+    return max(0, min(int(min_gp), 82)), max(1, min(int(limit), 25))
 
-    # Defense
-    cards.append(
-        _card(
-            card_key="steals",
-            title="Steals",
-            default_option_key="spg",
-            options=[
-                {"key": "spg", "label": "SPG", "expr": "STL", "format": "1dp"},
-                {"key": "total", "label": "Total", "expr": "STL*GP", "format": "0dp"},
-            ],
-            df=df,
-            limit=limit,
-        )
-    )
-    cards.append(
-        _card(
-            card_key="blocks",
-            title="Blocks",
-            default_option_key="bpg",
-            options=[
-                {"key": "bpg", "label": "BPG", "expr": "BLK", "format": "1dp"},
-                {"key": "total", "label": "Total", "expr": "BLK*GP", "format": "0dp"},
-            ],
-            df=df,
-            limit=limit,
-        )
-    )
 
-    # Turnovers
-    cards.append(
-        _card(
-            card_key="turnovers",
-            title="Turnovers",
-            default_option_key="tpg",
-            options=[
-                {"key": "tpg", "label": "TOV/G", "expr": "TOV", "format": "1dp"},
-                {"key": "total", "label": "Total", "expr": "TOV*GP", "format": "0dp"},
-            ],
-            df=df,
-            limit=limit,
-        )
-    )
+def _card_key(card: Dict[str, Any]) -> Tuple:
+    return tuple(tuple(sorted(o.items())) for o in card["options"]) + (card["title"],)
 
-    return {"minGp": min_gp, "limit": limit, "cards": cards}
+
+def _cached_payload(
+    ds: Dataset,
+    min_gp: int,
+    limit: int,
+    extra_cards: Tuple[Dict[str, Any], ...] = (),
+) -> Dict[str, Any]:
+    key = (min_gp, limit, ds.version, tuple(_card_key(c) for c in extra_cards))
+    if extra_cards:
+        cache, size = _CUSTOM_PAYLOAD_CACHE, _CUSTOM_PAYLOAD_CACHE_SIZE
+    else:
+        cache, size = _PAYLOAD_CACHE, _PAYLOAD_CACHE_SIZE
+    with _PAYLOAD_LOCK:
+        hit = cache.get(key)
+        if hit is not None:
+            cache.move_to_end(key)
+            return hit
+
+    payload = _build_payload(load_leader_matrix(ds), min_gp=min_gp, limit=limit, extra_cards=extra_cards)
+
+    with _PAYLOAD_LOCK:
+        cache[key] = payload
+        while len(cache) > size:
+            cache.popitem(last=False)
+    return payload
+
+
+def warm_leaders_cache(ds: Optional[Dataset] = None) -> None:
+    """Build the default payloads for a roster version and drop older versions."""
+    ds = ds or master_roster_dataset()
+    with _PAYLOAD_LOCK:
+        for cache in (_PAYLOAD_CACHE, _CUSTOM_PAYLOAD_CACHE):
+            for key in [k for k in cache if k[2] != ds.version]:
+                del cache[key]
+    for min_gp, limit in WARM_DEFAULTS:
+        _cached_payload(ds, *_normalize_args(min_gp, limit))
+
+
+# ---------------- public API ----------------
+def get_leaders_payload(
+    *,
+    min_gp: int = 10,
+    limit: int = 5,
+    custom: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Leader cards for the StatLeadersTab. `custom` is an optional extra card
+    (see custom_card) appended after the standard ones.
+    """
+    min_gp, limit = _normalize_args(min_gp, limit)
+
+    ds = master_roster_dataset()
+    # runs once per roster version, so the common requests are a dict lookup
+    ds.derived("leaders_warm", warm_leaders_cache)
+    return _cached_payload(ds, min_gp, limit, (custom,) if custom else ())
@@ -0,0 +1,141 @@
+# src/leagues/nba/api/nba_player_search.py
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set, Tuple
+
+import pandas as pd
+
+from src.common.datasets import STORE, Dataset
+
+# ranks (lower is better)
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING = 0, 1, 2, 3
+
+MAX_GRAM = 3
+NAME_COLS = ["PLAYER_NAME", "PLAYER_NAME_STATS"]
+
+_DROP_RE = re.compile(r"['’.]")
+_SEP_RE = re.compile(r"[^a-z0-9]+")
+# letters NFKD leaves alone (no decomposition); applied after lowercasing
+_TRANSLIT = str.maketrans({"đ": "d", "ø": "o", "ł": "l", "ß": "ss", "æ": "ae", "þ": "th"})
+
+
+def normalize_name(name: Any) -> str:
+    """
+    Accent-folded, lowercase search key.
+      "Nikola Jokić"  -> "nikola jokic"
+      "D'Angelo Russell" -> "dangelo russell"
+      "Karl-Anthony Towns" -> "karl anthony towns"
+      "Nikola Đurišić" -> "nikola durisic"
+    """
+    if name is None or (isinstance(name, float) and pd.isna(name)):
+        return ""
+    s = unicodedata.normalize("NFKD", str(name))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch)).lower().translate(_TRANSLIT)
+    s = _DROP_RE.sub("", s)
+    return _SEP_RE.sub(" ", s).strip()
+
+
+@dataclass
+class PlayerSearchIndex:
+    """
+    In-memory player name index, built once per roster_master version.
+
+    - `exact`: normalized name -> players
+    - `prefix_keys`: sorted (key, player, is_full_name) where key is the full
+      name or the name from each word onward, so prefix lookups are a bisect
+    - `grams`: 1..3-character substrings -> players (trigram candidates for
+      longer queries are verified with a plain `in`)
+    """
+
+    players: List[Dict[str, Any]] = field(default_factory=list)
+    names: List[Tuple[str, ...]] = field(default_factory=list)
+    exact: Dict[str, Set[int]] = field(default_factory=dict)
+    prefix_keys: List[Tuple[str, int, bool]] = field(default_factory=list)
+    grams: Dict[str, Set[int]] = field(default_factory=dict)
+
+    def _add(self, i: int, norm: str) -> None:
+        self.exact.setdefault(norm, set()).add(i)
+
+        self.prefix_keys.append((norm, i, True))
+        for m in re.finditer(r" ", norm):
+            self.prefix_keys.append((norm[m.end():], i, False))
+
+        for n in range(1, MAX_GRAM + 1):
+            for k in range(len(norm) - n + 1):
+                self.grams.setdefault(norm[k:k + n], set()).add(i)
+
+    def _prefix_hits(self, q: str) -> Dict[int, int]:
+        hits: Dict[int, int] = {}
+        pos = bisect_left(self.prefix_keys, (q, -1, False))
+        while pos < len(self.prefix_keys) and self.prefix_keys[pos][0].startswith(q):
+            key, i, full = self.prefix_keys[pos]
+            rank = PREFIX if full else WORD_PREFIX
+            hits[i] = min(rank, hits.get(i, rank))
+            pos += 1
+        return hits
+
+    def _substring_hits(self, q: str) -> Set[int]:
+        if len(q) <= MAX_GRAM:
+            return set(self.grams.get(q, ()))
+
+        grams = {q[k:k + MAX_GRAM] for k in range(len(q) - MAX_GRAM + 1)}
+        postings = sorted((self.grams.get(g, set()) for g in grams), key=len)
+        cand = set(postings[0]).intersection(*postings[1:])
+        return {i for i in cand if any(q in n for n in self.names[i])}
+
+    def search(self, query: str, limit: int = 25) -> List[Dict[str, Any]]:
+        q = normalize_name(query)
+        if not q:
+            return []
+
+        ranked: Dict[int, int] = {i: EXACT for i in self.exact.get(q, ())}
+        for i, rank in self._prefix_hits(q).items():
+            ranked.setdefault(i, rank)
+
+        if len(ranked) < limit:
+            for i in self._substring_hits(q):
+                ranked.setdefault(i, SUBSTRING)
+
+        order = sorted(ranked, key=lambda i: (ranked[i], self.names[i][0], i))
+        return [self.players[i] for i in order[:limit]]
+
+
+def _build_index(ds: Dataset) -> PlayerSearchIndex:
+    df = ds.df
+    cols = [c for c in ["PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION"] if c in df.columns]
+    name_cols = [c for c in NAME_COLS if c in df.columns]
+    df = df.drop_duplicates(subset=["PLAYER_ID"])
+
+    idx = PlayerSearchIndex()
+    for row in df[cols + [c for c in name_cols if c not in cols]].to_dict(orient="records"):
+        norms = tuple(dict.fromkeys(n for n in (normalize_name(row.get(c)) for c in name_cols) if n))
+        if not norms:
+            continue
+
+        i = len(idx.players)
+        idx.players.append(
+            {
+                "playerId": int(row["PLAYER_ID"]) if pd.notna(row.get("PLAYER_ID")) else None,
+                "name": str(row.get("PLAYER_NAME")) if pd.notna(row.get("PLAYER_NAME")) else None,
+                "teamId": int(row["TEAM_ID"]) if pd.notna(row.get("TEAM_ID")) else None,
+                "teamAbbr": row.get("TEAM_ABBREVIATION") if pd.notna(row.get("TEAM_ABBREVIATION")) else None,
+            }
+        )
+        idx.names.append(norms)
+        for norm in norms:
+            idx._add(i, norm)
+
+    idx.prefix_keys.sort()
+    return idx
+
+
+def load_player_search_index() -> PlayerSearchIndex:
+    return STORE.get("nba_roster_master").derived("player_search", _build_index)
+
+
+def search_players(query: str, *, limit: int = 25) -> List[Dict[str, Any]]:
+    return load_player_search_index().search(query, limit=limit)
@@ -0,0 +1,74 @@
+# src/leagues/nba/api/nba_schedule.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.common.datasets import STORE, Dataset, to_records
+from src.leagues.nba.pipeline.team_utils import normalize_team_name
+
+
+@dataclass
+class ScheduleIndex:
+    """
+    games.csv sorted by (GAME_DATE_EST, GAME_ID).
+
+    `dates` is aligned with `records`, so a day or a date range is two
+    binary searches and a contiguous slice. Normalized team names are kept
+    alongside for the optional team filter.
+    """
+
+    records: List[Dict[str, Any]]
+    dates: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+
+    def between(self, start: str, end: str, *, team: Optional[str] = None) -> List[Dict[str, Any]]:
+        lo = int(np.searchsorted(self.dates, start, side="left"))
+        hi = int(np.searchsorted(self.dates, end, side="right"))
+        if hi <= lo:
+            return []
+        if not team:
+            return self.records[lo:hi]
+
+        t = normalize_team_name(team)
+        mask = (self.home[lo:hi] == t) | (self.away[lo:hi] == t)
+        return [self.records[lo + i] for i in np.flatnonzero(mask)]
+
+
+def _build_index(ds: Dataset) -> ScheduleIndex:
+    df = ds.df.copy(deep=False)  # copy-on-write: column writes below never reach the cache
+    df["_DATE_KEY"] = df["GAME_DATE_EST"].astype(str)
+    df = df.sort_values(["_DATE_KEY", "GAME_ID"], kind="mergesort")
+
+    def _teams(col: str) -> np.ndarray:
+        if col not in df.columns:
+            return np.full(len(df), "", dtype=object)
+        return df[col].map(normalize_team_name).to_numpy(dtype=object)
+
+    return ScheduleIndex(
+        records=to_records(df.drop(columns=["_DATE_KEY"])),
+        dates=df["_DATE_KEY"].to_numpy(dtype="U"),
+        home=_teams("HOME_TEAM"),
+        away=_teams("AWAY_TEAM"),
+    )
+
+
+def schedule_index(ds: Dataset) -> ScheduleIndex:
+    """Index for one loaded version of games.csv (built once per version)."""
+    return ds.derived("schedule_index", _build_index)
+
+
+def load_schedule_index() -> ScheduleIndex:
+    """Index for the current games.csv; rebuilt only when the file changes."""
+    return schedule_index(STORE.get("nba_games"))
+
+
+def games_on(day: str, *, team: Optional[str] = None) -> List[Dict[str, Any]]:
+    return load_schedule_index().between(day, day, team=team)
+
+
+def games_between(start: str, end: str, *, team: Optional[str] = None) -> List[Dict[str, Any]]:
+    return load_schedule_index().between(start, end, team=team)
@@ -1,35 +1,90 @@
+from dataclasses import dataclass, field
+from typing import List
+
 from nba_api.stats.endpoints import leaguegamelog
 import pandas as pd
-import time
 
-def fetch_regular_season_logs(seasons, sleep_sec=1.0):
+from src.common.storage import read_partition, write_partition
+from src.leagues.nba.pipeline.nba_season import current_nba_season
+from src.leagues.nba.pipeline.stats_client import stats_rate
+
+# finished seasons are cached here, one partition per season string ("2023-24")
+TEAM_LOGS_PARTITIONS = "nba_team_game_logs"
+
+
+@dataclass
+class SeasonLogs:
+    games: pd.DataFrame
+    # SEASON values (start years) fetched from the API this run; the others came from partitions
+    refreshed: List[int] = field(default_factory=list)
+
+
+def _season_str(season: int) -> str:
+    return f"{season-1}-{str(season)[-2:]}"  # e.g. 2024 -> "2023-24"
+
+
+def _fetch_season(season_str):
+    logs = leaguegamelog.LeagueGameLog(
+        season=season_str,
+        season_type_all_star="Regular Season"
+    )
+    df = logs.get_data_frames()[0]
+
+    # Keep only regular season games based on SEASON_ID
+    df = df[df["SEASON_ID"].astype(str).str.startswith("2")].copy()
+
+    # Extract SEASON_START_YEAR from SEASON_ID (e.g. 22024 -> 2024)
+    df["SEASON"] = df["SEASON_ID"].astype(str).str[1:].astype(int)
+    return df
+
+
+def load_regular_season_logs(seasons, sleep_sec=1.0, *, refresh_all=False) -> SeasonLogs:
     """
-    Fetch regular season game logs for all teams using LeagueGameLog.
-    Extract SEASON_START_YEAR from SEASON_ID.
+    Regular season game logs for all teams, one LeagueGameLog call per season.
+
+    Finished seasons are immutable: the first fetch after a season has ended
+    is written as a partition and later runs read it from disk. Only the
+    in-progress season (and any season not cached yet) hits the API.
+    `refresh_all=True` refetches everything and rewrites the partitions.
     """
+    current = current_nba_season()
     all_games = []
+    refreshed = []
+    from_cache = 0
 
-    for season in seasons:
-        season_str = f"{season-1}-{str(season)[-2:]}"  # e.g. 2024 -> "2023-24"
-        print(f"📅 Fetching season {season_str}...")
-
-        try:
-            logs = leaguegamelog.LeagueGameLog(
-                season=season_str,
-                season_type_all_star="Regular Season"
-            )
-            df = logs.get_data_frames()[0]
+    # at most one request per sleep_sec; recorded responses skip the wait
+    with stats_rate(1.0 / sleep_sec if sleep_sec else None):
+        for season in seasons:
+            season_str = _season_str(season)
+            finished = season_str < current
 
-            # Keep only regular season games based on SEASON_ID
-            df = df[df["SEASON_ID"].astype(str).str.startswith("2")].copy()
+            if finished and not refresh_all:
+                cached = read_partition(TEAM_LOGS_PARTITIONS, season_str)
+                if cached is not None:
+                    all_games.append(cached)
+                    from_cache += 1
+                    continue
 
-            # Extract SEASON_START_YEAR from SEASON_ID (e.g. 22024 -> 2024)
-            df["SEASON"] = df["SEASON_ID"].astype(str).str[1:].astype(int)
+            print(f"📅 Fetching season {season_str}...")
+            try:
+                df = _fetch_season(season_str)
+            except Exception as e:
+                print(f"❌ Failed to fetch {season_str}: {e}")
+                continue
 
+            # the in-progress season changes daily, so it never becomes a partition
+            if finished:
+                write_partition(df, TEAM_LOGS_PARTITIONS, season_str)
             all_games.append(df)
-            time.sleep(sleep_sec)
+            refreshed.extend(int(s) for s in df["SEASON"].unique())
+
+    print(f"📦 {from_cache} seasons from cache, {len(all_games) - from_cache} fetched")
+    return SeasonLogs(games=pd.concat(all_games, ignore_index=True), refreshed=refreshed)
 
-        except Exception as e:
-            print(f"❌ Failed to fetch {season_str}: {e}")
 
-    return pd.concat(all_games, ignore_index=True)
+def fetch_regular_season_logs(seasons, sleep_sec=1.0):
+    """
+    Fetch regular season game logs for all teams using LeagueGameLog.
+    Extract SEASON_START_YEAR from SEASON_ID.
+    """
+    return load_regular_season_logs(seasons, sleep_sec).games
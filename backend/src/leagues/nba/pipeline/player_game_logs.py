@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-import time
-from typing import Iterable, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
 import pandas as pd
-from nba_api.stats.endpoints import playergamelog
+from nba_api.stats.endpoints import leaguegamelog, playergamelog
 
-from src.common.paths import CSV
+from src.common.fetcher import fetch_all
+from src.common.storage import conform, read_dataset, write_dataset
+import src.leagues.nba.schema  # noqa: F401  (registers the NBA dataset dtypes)
 from src.leagues.nba.pipeline.nba_season import current_nba_season
+from src.leagues.nba.pipeline.stats_client import (
+    STATS_RETRY,
+    STATS_TIMEOUT_S,
+    STATS_WORKERS,
+    stats_rate,
+)
 
 
 KEEP_COLS = [
@@ -26,8 +33,7 @@ def _load_player_index() -> pd.DataFrame:
     """
     Uses your roster master as the player index (PLAYER_ID, PLAYER_NAME, TEAM info).
     """
-    roster_path = CSV["nba_roster_master"]
-    df = pd.read_csv(roster_path)
+    df = read_dataset("nba_roster_master")
 
     cols = [
         c for c in ["PLAYER_ID", "PLAYER_NAME", "TEAM_ID", "TEAM_ABBREVIATION"]
@@ -40,127 +46,306 @@ def _load_player_index() -> pd.DataFrame:
 
     return players
 
-def _parse_matchup(matchup: str) -> tuple[str | None, bool | None]:
+def _matchup_columns(out: pd.DataFrame) -> None:
     """
-    Returns (opponent_abbr, is_home)
-    Examples:
-      "LAL @ BOS"  -> ("BOS", False)
-      "LAL vs BOS" -> ("BOS", True)
+    Derive OPP_TEAM_ABBR / IS_HOME / IS_AWAY from MATCHUP, vectorized:
+      "LAL @ BOS"   -> ("BOS", False)
+      "LAL vs. BOS" -> ("BOS", True)
+    Unparseable matchups get NA in all three.
     """
-    if not isinstance(matchup, str):
-        return None, None
+    if "MATCHUP" not in out.columns:
+        out["OPP_TEAM_ABBR"] = None
+        out["IS_HOME"] = None
+        out["IS_AWAY"] = None
+        return
 
-    if "@" in matchup:
-        opp = matchup.split("@", 1)[1].strip()
-        return opp, False
-    if "vs" in matchup:
-        opp = matchup.split("vs", 1)[1].strip()
-        return opp, True
+    parts = out["MATCHUP"].astype("string").str.extract(r"(@|vs\.?)\s*(.*\S)")
+    is_home = parts[0].str.startswith("vs")
+    out["OPP_TEAM_ABBR"] = parts[1].astype(object)  # plain labels; NA stays NA, not "nan"
+    out["IS_HOME"] = is_home
+    out["IS_AWAY"] = ~is_home
 
-    return None, None
 
-def build_player_game_logs_csv(
+def _canonical_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """KEEP_COLS + player/team ids + matchup splits from a raw game log frame with PLAYER_ID/PLAYER_NAME."""
+    # Normalize GAME_DATE: "JAN 15, 2026" / "2026-01-15" -> "YYYY-MM-DD"
+    if "GAME_DATE" in df.columns:
+        df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], errors="coerce", format="mixed").dt.date.astype(str)
+
+    keep = [c for c in KEEP_COLS if c in df.columns]
+    out = df[keep].copy()
+
+    # Ensure GAME_ID exists even if missing from this player's df
+    if "GAME_ID" not in out.columns:
+        out["GAME_ID"] = None
+
+    out["PLAYER_ID"] = df["PLAYER_ID"]
+    out["PLAYER_NAME"] = df["PLAYER_NAME"]
+
+    if "TEAM_ABBREVIATION" in df.columns:
+        out["TEAM_ABBREVIATION"] = df["TEAM_ABBREVIATION"]
+    if "TEAM_ID" in df.columns:
+        out["TEAM_ID"] = df["TEAM_ID"]
+
+    _matchup_columns(out)
+    return out
+
+
+def fetch_player_game_log(
+    player_id: int,
     *,
-    season: Optional[str] = None,
-    season_type: str = "Regular Season",
-    sleep_s: float = 0.6,
-    player_ids: Optional[Iterable[int]] = None,
+    season: str,
+    season_type: str,
+    date_from: Optional[str] = None,
 ) -> pd.DataFrame:
     """
-    Build a canonical player game logs dataset (one row per player-game).
-    Output is meant to be filtered by the API to return last 5/10 games.
-
-    Notes:
-    - This hits nba_api once per player (v1). Keep sleep_s to avoid rate limits.
-    - You can later optimize by only updating recent days.
+    One PlayerGameLog request (raises on HTTP/parse errors so the fetcher can retry).
+    `date_from` ("YYYY-MM-DD", inclusive) limits it to games on or after that day.
     """
-    season = season or current_nba_season()
+    resp = playergamelog.PlayerGameLog(
+        player_id=player_id,
+        season=season,
+        season_type_all_star=season_type,
+        date_from_nullable=_api_date(date_from) if date_from else "",
+        timeout=STATS_TIMEOUT_S,
+    )
+    return resp.get_data_frames()[0]
+
+
+def _api_date(day: str) -> str:
+    # stats.nba.com date params are MM/DD/YYYY
+    return pd.Timestamp(day).strftime("%m/%d/%Y")
 
+
+def fetch_league_player_logs(
+    *,
+    season: str,
+    season_type: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Every player-game of a season in one LeagueGameLog request (player mode),
+    optionally bounded by `date_from` / `date_to` ("YYYY-MM-DD", inclusive).
+    """
+    resp = leaguegamelog.LeagueGameLog(
+        player_or_team_abbreviation="P",
+        season=season,
+        season_type_all_star=season_type,
+        date_from_nullable=_api_date(date_from) if date_from else "",
+        date_to_nullable=_api_date(date_to) if date_to else "",
+        timeout=STATS_TIMEOUT_S,
+    )
+    return resp.get_data_frames()[0]
+
+
+def _player_rows(df: pd.DataFrame, pid: int, pname) -> Optional[pd.DataFrame]:
+    """Canonical rows for one player's raw PlayerGameLog frame (None if empty)."""
+    if df is None or df.empty:
+        return None
+
+    # PlayerGameLog spells it Game_ID (LeagueGameLog and the schedule use GAME_ID)
+    if "Game_ID" in df.columns and "GAME_ID" not in df.columns:
+        df = df.rename(columns={"Game_ID": "GAME_ID"})
+
+    df = df.assign(PLAYER_ID=pid, PLAYER_NAME=pname)
+    return _canonical_rows(df)
+
+
+# ---------------- fetch modes ----------------
+def _fetch_per_player(
+    fetch: Callable[[int], pd.DataFrame],
+    player_ids: Optional[Iterable[int]],
+    workers: int,
+    rate_per_s: Optional[float],
+) -> List[pd.DataFrame]:
     players = _load_player_index()
     if player_ids is not None:
         pid_set = set(int(x) for x in player_ids)
         players = players[players["PLAYER_ID"].isin(pid_set)].copy()
 
+    names = dict(zip(players["PLAYER_ID"].astype(int), players["PLAYER_NAME"]))
+    with stats_rate(rate_per_s):
+        results = fetch_all(
+            list(names),
+            fetch,
+            workers=workers,
+            retry=STATS_RETRY,
+            label="player_game_logs",
+        )
+
     rows = []
-    total = len(players)
+    for r in results:
+        if not r.ok:
+            print(f"[player_game_logs] error player_id={r.key} name={names[r.key]} "
+                  f"after {r.attempts} attempts: {r.error}")
+            continue
+        out = _player_rows(r.value, r.key, names[r.key])
+        if out is not None:
+            rows.append(out)
+    return rows
+
+
+def _fetch_bulk(
+    season: str,
+    season_type: str,
+    date_from: Optional[str],
+    date_to: Optional[str],
+    player_ids: Optional[Iterable[int]],
+    fetch_league: Optional[Callable[[], pd.DataFrame]],
+    rate_per_s: Optional[float],
+) -> List[pd.DataFrame]:
+    fetch_league = fetch_league or (lambda: fetch_league_player_logs(
+        season=season, season_type=season_type, date_from=date_from, date_to=date_to
+    ))
+    with stats_rate(rate_per_s):
+        [r] = fetch_all([season], lambda _: fetch_league(), workers=1,
+                        retry=STATS_RETRY, label="player_game_logs")
+    if not r.ok:
+        print(f"[player_game_logs] error league game log season={season} "
+              f"after {r.attempts} attempts: {r.error}")
+        return []
+
+    df = r.value
+    if df is None or df.empty:
+        return []
+    if player_ids is not None:
+        df = df[df["PLAYER_ID"].isin({int(x) for x in player_ids})]
+    print(f"[player_game_logs] league game log: {len(df)} player-games "
+          f"({date_from or 'season start'} .. {date_to or 'today'})")
+    return [_canonical_rows(df.copy())]
 
-    for i, p in enumerate(players.itertuples(index=False), start=1):
-        pid = int(getattr(p, "PLAYER_ID"))
-        pname = getattr(p, "PLAYER_NAME", None)
 
-        try:
-            resp = playergamelog.PlayerGameLog(
-                player_id=pid,
-                season=season,
-                season_type_all_star=season_type,
-            )
-            df = resp.get_data_frames()[0]
-        except Exception as e:
-            print(f"[player_game_logs] error player_id={pid} name={pname}: {e}")
-            if sleep_s > 0:
-                time.sleep(sleep_s)
-            continue
+# ---------------- incremental updates ----------------
+def _season_rows(df: pd.DataFrame, season: str, season_type: str) -> pd.Series:
+    if "SEASON" not in df.columns or "SEASON_TYPE" not in df.columns:
+        return pd.Series(False, index=df.index)
+    return (df["SEASON"].astype(str) == season) & (df["SEASON_TYPE"].astype(str) == season_type)
 
-        if df is None or df.empty:
-            if sleep_s > 0:
-                time.sleep(sleep_s)
-            continue
 
-        # Normalize GAME_DATE: "JAN 15, 2026" -> "YYYY-MM-DD"
-        if "GAME_DATE" in df.columns:
-            df["GAME_DATE"] = pd.to_datetime(df["GAME_DATE"], errors="coerce").dt.date.astype(str)
+def latest_game_dates(existing: pd.DataFrame, *, season: str, season_type: str) -> Dict[int, str]:
+    """Latest stored GAME_DATE ("YYYY-MM-DD") per PLAYER_ID for one season/season type."""
+    rows = existing[_season_rows(existing, season, season_type)]
+    if rows.empty or "GAME_DATE" not in rows.columns:
+        return {}
+    dates = pd.to_datetime(rows["GAME_DATE"].astype(str), errors="coerce")
+    latest = dates.groupby(rows["PLAYER_ID"].astype(int).to_numpy()).max().dropna()
+    return {int(pid): d.strftime("%Y-%m-%d") for pid, d in latest.items()}
 
-        keep = [c for c in KEEP_COLS if c in df.columns]
-        out = df[keep].copy()
 
-        # Ensure GAME_ID exists even if missing from this player's df
-        if "GAME_ID" not in out.columns:
-            out["GAME_ID"] = df["GAME_ID"] if "GAME_ID" in df.columns else None
+def _keys(df: pd.DataFrame, col: str) -> pd.Series:
+    return df["PLAYER_ID"].astype("string") + ":" + df[col].astype("string")
 
-        out["PLAYER_ID"] = pid
-        out["PLAYER_NAME"] = pname
 
-        if "TEAM_ABBREVIATION" in df.columns:
-            out["TEAM_ABBREVIATION"] = df["TEAM_ABBREVIATION"]
-        if "TEAM_ID" in df.columns:
-            out["TEAM_ID"] = df["TEAM_ID"]
+def upsert_game_logs(existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merge freshly fetched rows into the stored logs; a new row replaces the
+    stored row with the same (PLAYER_ID, GAME_ID). Stored rows written before
+    GAME_ID was captured match on (PLAYER_ID, GAME_DATE) instead.
+    """
+    if existing.empty:
+        return new
+    if new.empty:
+        return existing
+
+    new_ids = _keys(new, "GAME_ID").dropna()
+    replaced = _keys(existing, "GAME_ID").isin(new_ids).fillna(False)
+    no_id = existing["GAME_ID"].isna()
+    if no_id.any():
+        replaced |= no_id & _keys(existing, "GAME_DATE").isin(_keys(new, "GAME_DATE")).fillna(False)
 
-        # ---- NEW: derive opponent + home/away splits from MATCHUP ----
-        if "MATCHUP" in out.columns:
-            parsed = out["MATCHUP"].apply(_parse_matchup)
-            out["OPP_TEAM_ABBR"] = parsed.apply(lambda x: x[0])
-            out["IS_HOME"] = parsed.apply(lambda x: x[1])
-            out["IS_AWAY"] = out["IS_HOME"].apply(lambda x: None if x is None else (not x))
-        else:
-            out["OPP_TEAM_ABBR"] = None
-            out["IS_HOME"] = None
-            out["IS_AWAY"] = None
+    kept = existing[~replaced.to_numpy(dtype=bool)]
+    return pd.concat([kept, new], ignore_index=True)
 
-        rows.append(out)
 
-        # throttle
-        if sleep_s > 0:
-            time.sleep(sleep_s)
+def build_player_game_logs_csv(
+    *,
+    season: Optional[str] = None,
+    season_type: str = "Regular Season",
+    sleep_s: Optional[float] = None,
+    player_ids: Optional[Iterable[int]] = None,
+    workers: int = STATS_WORKERS,
+    rate_per_s: Optional[float] = None,
+    fetch: Optional[Callable[[int], pd.DataFrame]] = None,
+    incremental: bool = False,
+    bulk: bool = False,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    fetch_league: Optional[Callable[[], pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    """
+    Build a canonical player game logs dataset (one row per player-game).
+    Output is meant to be filtered by the API to return last 5/10 games.
 
-        if i % 50 == 0 or i == total:
-            print(f"[player_game_logs] fetched {i}/{total} players")
+    Notes:
+    - One PlayerGameLog request per player, `workers` in flight at once and
+      throttled to `rate_per_s` overall (defaults: NBA_STATS_WORKERS /
+      NBA_STATS_RATE; see stats_client). Failures retry with backoff.
+      Responses recorded by the stats cache are reused without a request.
+    - `sleep_s` is the old per-request pause; if given it sets the rate to 1/sleep_s.
+    - `fetch(player_id) -> DataFrame` replaces the nba_api call (stubs, tests);
+      NBA_STATS_BASE_URL points the real call at a local stub server instead.
+    - `incremental=True` keeps the stored logs and only asks for each player's
+      games since their latest stored GAME_DATE (that day included, in case it
+      was still in progress), then upserts by (PLAYER_ID, GAME_ID). Players
+      with nothing stored for this season get their full season; rows of other
+      seasons are kept as they are. Without it the file is rebuilt from scratch.
+    - `bulk=True` pulls every player-game of the season from one LeagueGameLog
+      request (player mode) instead of one request per player, bounded by
+      `date_from` / `date_to` if given. With `incremental` it starts from the
+      earliest of the players' latest stored GAME_DATEs, so a player whose
+      logs stop early is backfilled too. `fetch_league() -> DataFrame`
+      replaces that call.
+    """
+    season = season or current_nba_season()
+    if rate_per_s is None and sleep_s:
+        rate_per_s = 1.0 / sleep_s
 
-    if not rows:
+    existing = pd.DataFrame()
+    since: Dict[int, str] = {}
+    if incremental:
+        try:
+            existing = read_dataset("nba_player_game_logs")
+        except FileNotFoundError:
+            existing = pd.DataFrame()
+        since = latest_game_dates(existing, season=season, season_type=season_type)
+        print(f"[player_game_logs] incremental: {len(since)} players with stored {season} games")
+
+    if bulk:
+        if date_from is None and since:
+            # from the player whose stored logs end earliest, so nobody is left
+            # with a gap; rows already stored come back and are upserted over
+            wanted = since if player_ids is None else {
+                pid: day for pid, day in since.items() if pid in {int(x) for x in player_ids}
+            }
+            date_from = min(wanted.values()) if wanted else None
+        rows = _fetch_bulk(season, season_type, date_from, date_to, player_ids, fetch_league, rate_per_s)
+    else:
+        fetch = fetch or (lambda pid: fetch_player_game_log(
+            pid, season=season, season_type=season_type, date_from=since.get(pid)
+        ))
+        rows = _fetch_per_player(fetch, player_ids, workers, rate_per_s)
+
+    if not rows and existing.empty:
         return pd.DataFrame(columns=["PLAYER_ID", "PLAYER_NAME"] + KEEP_COLS)
 
-    all_logs = pd.concat(rows, ignore_index=True)
+    if rows:
+        all_logs = pd.concat(rows, ignore_index=True)
 
-    # Make types sane
-    if "PLAYER_ID" in all_logs.columns:
-        all_logs["PLAYER_ID"] = pd.to_numeric(all_logs["PLAYER_ID"], errors="coerce").astype("Int64")
+        # Add metadata
+        all_logs["SEASON"] = season
+        all_logs["SEASON_TYPE"] = season_type
 
-    for col in ["PTS", "REB", "AST", "MIN"]:
-        if col in all_logs.columns:
-            all_logs[col] = pd.to_numeric(all_logs[col], errors="coerce")
+        # Compact dtypes (Int16 counts, Int32 ids, categorical labels; see leagues/nba/schema.py)
+        all_logs = conform(all_logs, "nba_player_game_logs")
+    else:
+        all_logs = existing.iloc[:0]
 
-    # Add metadata
-    all_logs["SEASON"] = season
-    all_logs["SEASON_TYPE"] = season_type
+    if incremental:
+        print(f"[player_game_logs] upserting {len(all_logs)} fetched rows into {len(existing)} stored")
+        all_logs = upsert_game_logs(existing, all_logs)
+        _matchup_columns(all_logs)  # also repairs rows stored by the old per-row parser
+        all_logs = conform(all_logs, "nba_player_game_logs")
 
     # Sort newest first (only by columns that exist)
     sort_cols = [c for c in ["GAME_DATE", "GAME_ID"] if c in all_logs.columns]
@@ -168,8 +353,6 @@ def build_player_game_logs_csv(
         all_logs = all_logs.sort_values(sort_cols, ascending=[False] * len(sort_cols))
 
     # Write output
-    out_path = CSV["nba_player_game_logs"]
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    all_logs.to_csv(out_path, index=False, encoding="utf-8")
+    write_dataset(all_logs, "nba_player_game_logs")
 
     return all_logs
@@ -5,6 +5,7 @@ import pandas as pd
 from nba_api.stats.endpoints import leaguedashplayerstats
 
 from src.leagues.nba.pipeline.nba_season import current_nba_season
+from src.leagues.nba.pipeline.stats_client import stats_rate
 
 
 def fetch_player_stats_per_game(
@@ -31,12 +32,13 @@ def fetch_player_stats_per_game(
 
     # nba_api returns totals + rate stats, but these columns are already PER GAME
     # (PTS, REB, AST, etc. are per game for this endpoint).
-    resp = leaguedashplayerstats.LeagueDashPlayerStats(
-        season=season,
-        season_type_all_star=season_type,
-        per_mode_detailed="PerGame",
-        # You can add more filters later (measure_type, date_from/to, etc.)
-    )
+    with stats_rate():
+        resp = leaguedashplayerstats.LeagueDashPlayerStats(
+            season=season,
+            season_type_all_star=season_type,
+            per_mode_detailed="PerGame",
+            # You can add more filters later (measure_type, date_from/to, etc.)
+        )
 
     df = resp.get_data_frames()[0]
     if df.empty:
@@ -2,13 +2,16 @@
 from nba_api.stats.endpoints import scheduleleaguev2
 import pandas as pd
 
+from src.leagues.nba.pipeline.stats_client import stats_rate
+
 def fetch_schedule(season: int) -> pd.DataFrame:
     """
     Returns the ENTIRE schedule (finished + future) for the given calendar year.
     Season string format: '2024-25'
     """
     season_str = f"{season - 1}-{str(season)[2:]}"
-    sched = scheduleleaguev2.ScheduleLeagueV2(season=season_str)
+    with stats_rate():
+        sched = scheduleleaguev2.ScheduleLeagueV2(season=season_str)
     df = sched.get_data_frames()[0]
 
     # pick columns that actually exist
@@ -1,10 +1,13 @@
 from nba_api.stats.endpoints import leaguestandings
 import pandas as pd
 
+from src.leagues.nba.pipeline.stats_client import stats_rate
+
 def fetch_standings(season: int) -> pd.DataFrame:
     """Returns current league standings DataFrame."""
     season_str = f"{season - 1}-{str(season)[2:]}"
-    ls = leaguestandings.LeagueStandings(season=season_str)
+    with stats_rate():
+        ls = leaguestandings.LeagueStandings(season=season_str)
     df = ls.get_data_frames()[0]
     # keep only what the front-end needs
     return df[["TeamID", "TeamName", "Conference", "ConferenceRecord",
@@ -0,0 +1,119 @@
+# src/leagues/nba/pipeline/stats_client.py
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from nba_api.stats.library.http import NBAStatsHTTP
+
+from src.common.fetcher import Retry, TokenBucket
+from src.common.http_cache import ResponseCache
+from src.common.paths import HTTP_CACHE
+
+# Shared settings for pipeline code that calls stats.nba.com through nba_api.
+# Importing this module changes nothing; install() routes every nba_api stats
+# request through the response cache and the shared rate limit below until
+# uninstall(). main.run_pipeline installs it up front, and every pipeline fetch
+# runs inside stats_rate(), which installs it with these settings if nobody has.
+#   NBA_STATS_BASE_URL  point nba_api at another host, e.g. a local stub:
+#                       http://127.0.0.1:8765/stats/{endpoint}
+#   NBA_STATS_RATE      network requests per second, process-wide
+#   NBA_STATS_WORKERS   concurrent requests in flight
+#   NBA_STATS_TIMEOUT_S per-request timeout
+#   NBA_STATS_CACHE     on (default) | replay (offline, recorded responses only) | off
+#   NBA_STATS_CACHE_DIR where responses are recorded (default data/http_cache/nba_stats)
+STATS_BASE_URL = os.environ.get("NBA_STATS_BASE_URL")
+STATS_RATE = float(os.environ.get("NBA_STATS_RATE", "2"))
+STATS_WORKERS = int(os.environ.get("NBA_STATS_WORKERS", "4"))
+STATS_TIMEOUT_S = float(os.environ.get("NBA_STATS_TIMEOUT_S", "30"))
+STATS_RETRY = Retry(attempts=4, base_delay=2.0, max_delay=30.0)
+
+# How long a recorded response is reused before it is fetched again (mode "on").
+# Short enough that a nightly run always sees new games; long enough that a
+# failed run can be restarted without repeating its requests.
+STATS_CACHE_TTL_S = {
+    "playergamelog": 3600,
+    "leaguegamelog": 3600,
+    "scheduleleaguev2": 3600,
+    "leaguestandings": 3600,
+    "leaguedashplayerstats": 3600,
+    "commonteamroster": 6 * 3600,  # rosters move on trades/signings, not per game
+}
+# set by install(); None while nba_api is untouched
+STATS_CACHE: Optional[ResponseCache] = None
+
+# Paces network requests only; cached and replayed responses come back at once.
+_pacer = TokenBucket(STATS_RATE, burst=1)
+
+
+@contextmanager
+def stats_rate(rate: Optional[float] = None) -> Iterator[None]:
+    """
+    Make the stats requests inside the block: installs the client if needed,
+    then paces network requests at `rate` per second (None: NBA_STATS_RATE).
+    """
+    global _pacer
+    ensure_installed()
+    if not rate:
+        yield
+        return
+    previous, _pacer = _pacer, TokenBucket(rate, burst=1)
+    try:
+        yield
+    finally:
+        _pacer = previous
+
+
+_send_api_request = NBAStatsHTTP.send_api_request
+_base_url = NBAStatsHTTP.base_url
+
+
+def _cached_send_api_request(self, endpoint, parameters, *args, **kwargs):
+    cache = STATS_CACHE
+    body = cache.get(endpoint, parameters)  # raises ReplayMiss when offline
+    if body is not None:
+        return self.nba_response(response=body, status_code=200, url=None)
+
+    _pacer.acquire()
+    data = _send_api_request(self, endpoint, parameters, *args, **kwargs)
+    if getattr(data, "_status_code", None) == 200 and data.valid_json():
+        cache.put(endpoint, parameters, data.get_response())
+    return data
+
+
+def install(
+    mode: Optional[str] = None,
+    *,
+    cache_dir: Optional[str] = None,
+    base_url: Optional[str] = None,
+) -> ResponseCache:
+    """
+    Route every nba_api stats request through the response cache (`mode`:
+    on | replay | off, default NBA_STATS_CACHE or "on") and the shared rate
+    limit, optionally against `base_url` (default NBA_STATS_BASE_URL).
+    Calling it again reconfigures; uninstall() restores nba_api.
+    """
+    global STATS_CACHE
+    STATS_CACHE = ResponseCache(
+        cache_dir or os.environ.get("NBA_STATS_CACHE_DIR") or HTTP_CACHE / "nba_stats",
+        ttl_s=STATS_CACHE_TTL_S,
+        default_ttl_s=3600,
+        mode=mode or os.environ.get("NBA_STATS_CACHE", "on"),
+    )
+    NBAStatsHTTP.base_url = base_url or STATS_BASE_URL or _base_url
+    NBAStatsHTTP.send_api_request = _cached_send_api_request
+    return STATS_CACHE
+
+
+def ensure_installed() -> ResponseCache:
+    """The installed cache; install() with the environment's settings first if needed."""
+    return STATS_CACHE if STATS_CACHE is not None else install()
+
+
+def uninstall() -> None:
+    """Put nba_api back the way it was before install()."""
+    global STATS_CACHE
+    NBAStatsHTTP.send_api_request = _send_api_request
+    NBAStatsHTTP.base_url = _base_url
+    STATS_CACHE = None
@@ -1,27 +1,28 @@
 from nba_api.stats.endpoints import commonteamroster
 from src.common.constants import PLAYER_ID_FIXES
 from src.leagues.nba.pipeline.nba_season import current_nba_season
+from src.leagues.nba.pipeline.stats_client import stats_rate
 import pandas as pd
-import time
 from datetime import datetime
 
 def generate_current_team_rosters(team_ids: list[int], team_id_to_name: dict, delay_sec: float = 1.0) -> pd.DataFrame:
     all_rosters = []
     current_season = current_nba_season()
 
-    for team_id in team_ids:
-        try:
-            team_name = team_id_to_name.get(team_id, "Unknown")
-            print(f"📥 Fetching roster for {team_name} (ID: {team_id}) - Season {current_season}")
-            roster = commonteamroster.CommonTeamRoster(team_id=team_id, season=current_season)
-            players = roster.get_data_frames()[0]
-            players["TEAM_ID"] = team_id
-            players["SEASON"] = int(current_season.split("-")[0])  # "2024-25" -> 2024
-            players["TEAM_NAME"] = team_name
-            all_rosters.append(players)
-            time.sleep(delay_sec)
-        except Exception as e:
-            print(f"❌ Failed to fetch roster for {team_id}: {e}")
+    # at most one request per delay_sec; recorded responses skip the wait
+    with stats_rate(1.0 / delay_sec if delay_sec else None):
+        for team_id in team_ids:
+            try:
+                team_name = team_id_to_name.get(team_id, "Unknown")
+                print(f"📥 Fetching roster for {team_name} (ID: {team_id}) - Season {current_season}")
+                roster = commonteamroster.CommonTeamRoster(team_id=team_id, season=current_season)
+                players = roster.get_data_frames()[0]
+                players["TEAM_ID"] = team_id
+                players["SEASON"] = int(current_season.split("-")[0])  # "2024-25" -> 2024
+                players["TEAM_NAME"] = team_name
+                all_rosters.append(players)
+            except Exception as e:
+                print(f"❌ Failed to fetch roster for {team_id}: {e}")
 
     if not all_rosters:
         return pd.DataFrame()
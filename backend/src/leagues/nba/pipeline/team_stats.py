@@ -29,3 +29,26 @@ def generate_team_season_stats(games_df):
     team_stats["avg_ft_pct"] *= 100
 
     return team_stats
+
+
+def update_team_season_stats(existing, games_df, refreshed):
+    """
+    Recompute team-season rows only for the SEASONs in `refreshed` (plus any
+    season the previous table lacks) and merge them into `existing`. Seasons
+    no longer in games_df are dropped, so the result matches a full rebuild.
+    """
+    if existing is None or existing.empty:
+        return generate_team_season_stats(games_df)
+
+    seasons = set(int(s) for s in games_df["SEASON"].unique())
+    kept = existing[existing["SEASON"].isin(seasons)]
+    stale = (set(refreshed) | (seasons - set(int(s) for s in kept["SEASON"].unique()))) & seasons
+    if not stale:
+        return kept.reset_index(drop=True)
+
+    fresh = generate_team_season_stats(games_df[games_df["SEASON"].isin(stale)].copy())
+    kept = kept[~kept["SEASON"].isin(stale)]
+    print(f"📊 Team stats: recomputed seasons {sorted(stale)}, kept {kept['SEASON'].nunique()}")
+
+    merged = pd.concat([kept.astype({"TEAM_NAME": str}), fresh], ignore_index=True)
+    return merged.sort_values(["TEAM_ID", "TEAM_NAME", "SEASON"]).reset_index(drop=True)
@@ -1,6 +1,7 @@
 import pandas as pd
 from nba_api.stats.endpoints import leaguedashplayerstats
 from src.common.constants import PLAYER_ID_FIXES
+from src.leagues.nba.pipeline.stats_client import stats_rate
 
 def get_top_player_stats_by_team(season: str) -> pd.DataFrame:
     """
@@ -11,15 +12,16 @@ def get_top_player_stats_by_team(season: str) -> pd.DataFrame:
     print(f"📊 Fetching player season averages for {season}...")
 
     # Fetch season averages
-    stats = leaguedashplayerstats.LeagueDashPlayerStats(
-        season=season,
-        season_type_all_star="Regular Season",
-        per_mode_detailed="PerGame",
-        measure_type_detailed_defense="Base",
-        plus_minus="N",
-        pace_adjust="N",
-        rank="N"
-    )
+    with stats_rate():
+        stats = leaguedashplayerstats.LeagueDashPlayerStats(
+            season=season,
+            season_type_all_star="Regular Season",
+            per_mode_detailed="PerGame",
+            measure_type_detailed_defense="Base",
+            plus_minus="N",
+            pace_adjust="N",
+            rank="N"
+        )
 
     df = stats.get_data_frames()[0]
 
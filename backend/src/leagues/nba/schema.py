@@ -0,0 +1,127 @@
+# src/leagues/nba/schema.py
+from __future__ import annotations
+
+from typing import Dict, List
+
+from src.common.datasets import STORE
+from src.common.schema import Schema
+from src.common.storage import register_schema
+
+# Declared dtypes for the processed NBA datasets. The pipeline writes with
+# them (write_dataset) and the loaders enforce them (DatasetStore), so the
+# Arrow and CSV copies come back as the same compact frame.
+#   category  - low-cardinality labels (teams, seasons, matchups, dates)
+#   Int16/32  - nullable counts and ids (TEAM_ID 1610612737 fits int32)
+#   float32   - per-game averages and rates
+#   boolean   - nullable flags
+# Columns not listed keep whatever the reader produced (free text, URLs).
+
+_PER_GAME = ["MIN", "PTS", "REB", "AST", "STL", "BLK", "TOV", "OREB", "DREB",
+             "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA"]
+_RATES = ["FG_PCT", "FG3_PCT", "FT_PCT", "TS_PCT"]
+
+NBA_SCHEMAS: Dict[str, Schema] = {
+    "nba_player_game_logs": {
+        "GAME_DATE": "category",
+        "MATCHUP": "category",
+        "WL": "category",
+        "MIN": "Int16",
+        "PTS": "Int16",
+        "REB": "Int16",
+        "AST": "Int16",
+        "GAME_ID": "Int64",  # same numeric form as nba_games.GAME_ID
+        "PLAYER_ID": "Int32",
+        "PLAYER_NAME": "category",
+        "TEAM_ID": "Int32",  # bulk (LeagueGameLog) rows only
+        "TEAM_ABBREVIATION": "category",
+        "OPP_TEAM_ABBR": "category",
+        "IS_HOME": "boolean",
+        "IS_AWAY": "boolean",
+        "SEASON": "category",
+        "SEASON_TYPE": "category",
+    },
+    "nba_roster_master": {
+        "SEASON": "Int16",
+        "POSITION": "category",
+        "HEIGHT": "category",
+        "WEIGHT": "Int16",
+        "AGE": "float32",
+        "EXP": "category",
+        "PLAYER_ID": "Int32",
+        "TEAM_ID": "Int32",
+        "TEAM_NAME": "category",
+        "TEAM_ABBREVIATION": "category",
+        "GP": "Int16",
+        **{c: "float32" for c in _PER_GAME + _RATES},
+        "SEASON_STATS": "Int16",
+        "SEASON_TYPE": "category",
+    },
+    "nba_rosters": {
+        "TeamID": "Int32",
+        "SEASON": "Int16",
+        "POSITION": "category",
+        "HEIGHT": "category",
+        "WEIGHT": "Int16",
+        "AGE": "float32",
+        "EXP": "category",
+        "PLAYER_ID": "Int32",
+        "TEAM_ID": "Int32",
+        "TEAM_NAME": "category",
+    },
+    "nba_games": {
+        "GAME_DATE_EST": "category",
+        "GAME_TIME_EST": "category",
+        # nba_api returns "0012500008"; the CSV always read it back as a number
+        "GAME_ID": "Int64",
+        "MATCHUP": "category",
+        "HOME_TEAM": "category",
+        "AWAY_TEAM": "category",
+        "HOME_PTS": "Int16",
+        "AWAY_PTS": "Int16",
+        "STATUS": "category",
+        "WL": "category",
+    },
+    "nba_team_stats": {
+        "TEAM_ID": "Int32",
+        "TEAM_NAME": "category",
+        "SEASON": "Int16",
+        "games_played": "Int16",
+        "wins": "Int16",
+        "losses": "Int16",
+    },
+    "nba_top_players": {
+        "TEAM_ABBREVIATION": "category",
+        "PLAYER_ID": "Int32",
+        "STAT": "category",
+        "SEASON": "category",
+    },
+    "nba_standings": {
+        "TeamID": "Int32",
+        "Conference": "category",
+        "Division": "category",
+        "WINS": "Int16",
+        "LOSSES": "Int16",
+    },
+    "nba_teams": {
+        "TEAM_ID": "Int32",
+    },
+}
+
+# Columns the store keeps a hash index on (one GroupIndex per file version).
+# csv_resp serves keyed routes from these and accepts `?<column>s=a,b,c`
+# (e.g. ?team_ids=1610612737,1610612738) for each of them.
+NBA_INDEXES: Dict[str, List[str]] = {
+    "nba_games": ["GAME_ID"],
+    "nba_team_stats": ["TEAM_ID", "SEASON"],
+    "nba_rosters": ["TEAM_ID", "PLAYER_ID", "SEASON"],
+    "nba_roster_master": ["TEAM_ID", "PLAYER_ID", "SEASON"],
+    "nba_top_players": ["PLAYER_ID", "SEASON"],
+    "nba_player_game_logs": ["PLAYER_ID", "GAME_ID", "SEASON"],
+    "nba_teams": ["TEAM_ID"],
+}
+
+for _key, _schema in NBA_SCHEMAS.items():
+    register_schema(_key, _schema)
+
+for _key, _cols in NBA_INDEXES.items():
+    STORE.declare_indexes(_key, _cols)
@@ -1,143 +1,225 @@
 from __future__ import annotations
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
 import pandas as pd
 
-from src.leagues.nba.api.nba_data import load_games_df
+from src.common.datasets import STORE, Dataset
+from src.leagues.nba.api.nba_schedule import schedule_index
 from src.leagues.nba.pipeline.team_utils import normalize_team_name
 
+SLATE_CACHE_SIZE = 64
+# guards every per-version slate LRU (request threads read, insert and evict)
+_SLATES_LOCK = threading.Lock()
+
+FINAL_STATUSES = ["FINAL", "Final", "COMPLETED", "Completed", "CLOSED", "Closed"]
+
+# RESULT codes (team perspective)
+WIN, LOSS, NO_RESULT = 1, -1, 0
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+_NO_DAY = np.iinfo("int64").max
+
+
+@dataclass
+class TeamResults:
+    """
+    Long-format "team-game results" table: one row per (team, completed game).
 
-def _winner(row: pd.Series) -> str | None:
-    # expects HOME_PTS / AWAY_PTS in df for completed games
-    hp = row.get("HOME_PTS")
-    ap = row.get("AWAY_PTS")
-    if pd.isna(hp) or pd.isna(ap):
-        return None
-    if float(hp) == float(ap):
-        return None
-    return "HOME" if float(hp) > float(ap) else "AWAY"
+    Rows are grouped by team and sorted newest first inside each group;
+    `spans` maps the normalized team name -> (start, stop). `neg_day` is
+    -days-since-epoch, so it ascends within a team and "games before a date"
+    is a binary search.
+    """
 
+    team: np.ndarray
+    opp: np.ndarray
+    neg_day: np.ndarray
+    is_home: np.ndarray
+    result: np.ndarray
+    spans: Dict[str, Tuple[int, int]]
 
-def _team_game_results(df: pd.DataFrame, team: str) -> pd.DataFrame:
-    """Return all games involving team, with W/L from team perspective."""
-    team = normalize_team_name(team)
+    def games(self, team: str, before: date) -> slice:
+        """Rows for `team` played before `before`, newest first."""
+        start, stop = self.spans.get(team, (0, 0))
+        cutoff = -int((np.datetime64(before, "D") - _EPOCH).astype("int64"))
+        lo = start + int(np.searchsorted(self.neg_day[start:stop], cutoff, side="right"))
+        return slice(lo, stop)
 
-    d = df.copy()
-    d["HOME_TEAM"] = d["HOME_TEAM"].map(normalize_team_name)
-    d["AWAY_TEAM"] = d["AWAY_TEAM"].map(normalize_team_name)
+
+def _build_team_results(ds: Dataset) -> TeamResults:
+    d = ds.df
+
+    # normalize each distinct name once instead of per row
+    names = pd.unique(pd.concat([d["HOME_TEAM"], d["AWAY_TEAM"]]).astype(str))
+    norm = {n: normalize_team_name(n) for n in names}
+    home = d["HOME_TEAM"].astype(str).map(norm)
+    away = d["AWAY_TEAM"].astype(str).map(norm)
+
+    hp = pd.to_numeric(d["HOME_PTS"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    ap = pd.to_numeric(d["AWAY_PTS"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
 
     # only games with final scores
-    d = d.dropna(subset=["HOME_PTS", "AWAY_PTS"], how="any")
-    d = d[d["STATUS"].isin(["FINAL", "Final", "COMPLETED", "Completed", "CLOSED", "Closed"]) | (d["HOME_PTS"] > 0) | (d["AWAY_PTS"] > 0)]
-
-    d["WINNER"] = d.apply(_winner, axis=1)
-
-    mask = (d["HOME_TEAM"] == team) | (d["AWAY_TEAM"] == team)
-    d = d[mask].copy()
-
-    # team perspective
-    d["IS_HOME"] = d["HOME_TEAM"] == team
-    d["RESULT"] = None
-    d.loc[d["WINNER"].isna(), "RESULT"] = None
-    d.loc[(d["IS_HOME"]) & (d["WINNER"] == "HOME"), "RESULT"] = "W"
-    d.loc[(d["IS_HOME"]) & (d["WINNER"] == "AWAY"), "RESULT"] = "L"
-    d.loc[(~d["IS_HOME"]) & (d["WINNER"] == "AWAY"), "RESULT"] = "W"
-    d.loc[(~d["IS_HOME"]) & (d["WINNER"] == "HOME"), "RESULT"] = "L"
-
-    # sort newest first
-    d["GAME_DATE_EST"] = pd.to_datetime(d["GAME_DATE_EST"], errors="coerce")
-    d = d.sort_values("GAME_DATE_EST", ascending=False)
-    return d
-
-
-def _record_from(df: pd.DataFrame) -> dict:
-    w = int((df["RESULT"] == "W").sum())
-    l = int((df["RESULT"] == "L").sum())
-    return {"w": w, "l": l}
-
-
-def _streak(df: pd.DataFrame) -> dict:
-    # df newest -> oldest
-    results = df["RESULT"].dropna().tolist()
-    if not results:
-        return {"type": None, "len": 0}
-    first = results[0]
-    n = 0
-    for r in results:
-        if r == first:
-            n += 1
-        else:
-            break
-    return {"type": first, "len": n}  # type: W or L
-
-
-def _rest_days(df: pd.DataFrame, target_date: date) -> dict:
-    if df.empty or df["GAME_DATE_EST"].isna().all():
+    done = ~np.isnan(hp) & ~np.isnan(ap)
+    done &= d["STATUS"].isin(FINAL_STATUSES).to_numpy(dtype=bool) | (hp > 0) | (ap > 0)
+
+    home_result = np.select([hp > ap, hp < ap], [WIN, LOSS], NO_RESULT).astype("int8")
+    day = pd.to_datetime(d["GAME_DATE_EST"], errors="coerce").to_numpy(dtype="datetime64[D]")
+    day = np.where(np.isnat(day), _NO_DAY, (day - _EPOCH).astype("int64"))
+    game_id = d["GAME_ID"].to_numpy() if "GAME_ID" in d.columns else np.zeros(len(d))
+
+    long = pd.DataFrame(
+        {
+            "TEAM": np.concatenate([home.to_numpy(dtype=object)[done], away.to_numpy(dtype=object)[done]]),
+            "OPP": np.concatenate([away.to_numpy(dtype=object)[done], home.to_numpy(dtype=object)[done]]),
+            "NEG_DAY": np.concatenate([-day[done], -day[done]]),
+            "GAME_ID": np.concatenate([game_id[done], game_id[done]]),
+            "IS_HOME": np.concatenate([np.ones(done.sum(), bool), np.zeros(done.sum(), bool)]),
+            "RESULT": np.concatenate([home_result[done], -home_result[done]]),
+        }
+    )
+    long = long.sort_values(["TEAM", "NEG_DAY", "GAME_ID"], ascending=[True, True, False], kind="mergesort")
+
+    team = long["TEAM"].to_numpy(dtype=object)
+    uniq, starts, counts = np.unique(team.astype(str), return_index=True, return_counts=True)
+
+    return TeamResults(
+        team=team,
+        opp=long["OPP"].to_numpy(dtype=object),
+        neg_day=long["NEG_DAY"].to_numpy(dtype="int64"),
+        is_home=long["IS_HOME"].to_numpy(dtype=bool),
+        result=long["RESULT"].to_numpy(dtype="int8"),
+        spans={str(t): (int(s), int(s + n)) for t, s, n in zip(uniq, starts, counts)},
+    )
+
+
+def load_team_results() -> TeamResults:
+    """Team results for the current games.csv; rebuilt only when the file changes."""
+    return STORE.get("nba_games").derived("team_results", _build_team_results)
+
+
+def _count(seg: np.ndarray, mask: np.ndarray, k: int) -> np.ndarray:
+    return np.bincount(seg[mask], minlength=k)
+
+
+def _insights_for_games(tr: TeamResults, games: List[Tuple[str, str]], target_date: date) -> List[dict]:
+    """
+    Insights for every (away, home) game in one pass over the team results.
+
+    Each game contributes two segments (away side, home side); every stat is
+    a bincount / first-row lookup over the concatenated per-segment slices.
+    """
+    if not games:
+        return []
+
+    teams = [normalize_team_name(t) for g in games for t in g]  # away0, home0, away1, home1, ...
+    partner = [teams[i ^ 1] for i in range(len(teams))]
+    k = len(teams)
+
+    spans = [tr.games(t, target_date) for t in teams]
+    starts = np.array([sp.start for sp in spans], dtype="int64")
+    sizes = np.array([sp.stop - sp.start for sp in spans], dtype="int64")
+
+    seg = np.repeat(np.arange(k), sizes)
+    rows = np.concatenate([np.arange(sp.start, sp.stop) for sp in spans]).astype("int64")
+    pos = rows - np.repeat(starts, sizes)  # 0 = most recent game for that segment
+
+    res = tr.result[rows]
+    home = tr.is_home[rows]
+    win, loss = res == WIN, res == LOSS
+
+    w, l = _count(seg, win, k), _count(seg, loss, k)
+    home_w, home_l = _count(seg, win & home, k), _count(seg, loss & home, k)
+    last10_w, last10_l = _count(seg, win & (pos < 10), k), _count(seg, loss & (pos < 10), k)
+
+    # streak: length of the first run of equal results (ties skipped), per segment
+    nz = res != NO_RESULT
+    r, s = res[nz], seg[nz]
+    new_run = np.r_[True, (r[1:] != r[:-1]) | (s[1:] != s[:-1])]
+    run_id = np.cumsum(new_run) - 1
+    run_len = np.bincount(run_id) if run_id.size else np.zeros(0, dtype="int64")
+    seg_first = {int(x): i for x, i in zip(*np.unique(s, return_index=True))}
+
+    # H2H: last 10 completed meetings, from the away side's rows
+    partner_arr = np.array(partner, dtype=object)
+    meet = tr.opp[rows] == partner_arr[seg]
+    meet_rank = np.cumsum(meet) - np.repeat(np.cumsum(_count(seg, meet, k)) - _count(seg, meet, k), sizes)
+    h2h = meet & (meet_rank <= 10)
+    h2h_w, h2h_l, h2h_n = _count(seg, h2h & win, k), _count(seg, h2h & loss, k), _count(seg, h2h, k)
+
+    def side(i: int, record_key: str, record: dict) -> dict:
+        first = seg_first.get(i)
+        streak = (
+            {"type": "W" if r[first] == WIN else "L", "len": int(run_len[run_id[first]])}
+            if first is not None
+            else {"type": None, "len": 0}
+        )
+        return {
+            "team": teams[i],
+            record_key: record,
+            "last10": {"w": int(last10_w[i]), "l": int(last10_l[i])},
+            "streak": streak,
+            **_rest_days(tr.neg_day[spans[i]], target_date),
+        }
+
+    out: List[dict] = []
+    for g in range(len(games)):
+        a, h = 2 * g, 2 * g + 1
+        out.append(
+            {
+                "date": target_date.isoformat(),
+                "away": side(a, "roadRecord", {"w": int(w[a] - home_w[a]), "l": int(l[a] - home_l[a])}),
+                "home": side(h, "homeRecord", {"w": int(home_w[h]), "l": int(home_l[h])}),
+                "h2hLast10": {"awayWins": int(h2h_w[a]), "homeWins": int(h2h_l[a]), "games": int(h2h_n[a])},
+            }
+        )
+    return out
+
+
+def _rest_days(neg_day: np.ndarray, target_date: date) -> dict:
+    days = neg_day[neg_day != -_NO_DAY]
+    if days.size == 0:
         return {"restDays": None, "b2b": None}
-    last_game = df["GAME_DATE_EST"].dropna().iloc[0].date()
-    delta = (target_date - last_game).days
+    last_game = _EPOCH + np.timedelta64(int(-days[0]), "D")
+    delta = int((np.datetime64(target_date, "D") - last_game).astype("int64"))
     # if they played yesterday => delta=1 => b2b today
     return {"restDays": max(delta, 0), "b2b": delta == 1}
 
 
 def get_matchup_insights(*, away_team: str, home_team: str, target_date: date) -> dict:
-    df = load_games_df().copy()
-
-    away_team = normalize_team_name(away_team)
-    home_team = normalize_team_name(home_team)
-
-    away_games = _team_game_results(df, away_team)
-    home_games = _team_game_results(df, home_team)
-
-    away_road = away_games[away_games["IS_HOME"] == False]
-    home_home = home_games[home_games["IS_HOME"] == True]
-
-    away_last10 = away_games.head(10)
-    home_last10 = home_games.head(10)
-
-    # H2H: last 10 meetings between the teams (either home/away)
-    dd = df.copy()
-    dd["HOME_TEAM"] = dd["HOME_TEAM"].map(normalize_team_name)
-    dd["AWAY_TEAM"] = dd["AWAY_TEAM"].map(normalize_team_name)
-    dd["GAME_DATE_EST"] = pd.to_datetime(dd["GAME_DATE_EST"], errors="coerce")
-    dd = dd.sort_values("GAME_DATE_EST", ascending=False)
-
-    h2h = dd[
-        ((dd["HOME_TEAM"] == home_team) & (dd["AWAY_TEAM"] == away_team)) |
-        ((dd["HOME_TEAM"] == away_team) & (dd["AWAY_TEAM"] == home_team))
-    ].copy()
-
-    h2h = h2h.dropna(subset=["HOME_PTS", "AWAY_PTS"], how="any").head(10)
-    h2h["WINNER"] = h2h.apply(_winner, axis=1)
-
-    away_wins = 0
-    home_wins = 0
-    for _, r in h2h.iterrows():
-        w = r["WINNER"]
-        if w == "HOME" and r["HOME_TEAM"] == away_team:
-            away_wins += 1
-        elif w == "AWAY" and r["AWAY_TEAM"] == away_team:
-            away_wins += 1
-        elif w == "HOME" and r["HOME_TEAM"] == home_team:
-            home_wins += 1
-        elif w == "AWAY" and r["AWAY_TEAM"] == home_team:
-            home_wins += 1
+    return _insights_for_games(load_team_results(), [(away_team, home_team)], target_date)[0]
 
+
+def _slate(ds: Dataset, target_date: date) -> dict:
+    # results and schedule from the same version, so a reload cannot mix them
+    tr = ds.derived("team_results", _build_team_results)
+    day = target_date.isoformat()
+    games = schedule_index(ds).between(day, day)
+    insights = _insights_for_games(tr, [(g["AWAY_TEAM"], g["HOME_TEAM"]) for g in games], target_date)
     return {
         "date": target_date.isoformat(),
-        "away": {
-            "team": away_team,
-            "roadRecord": _record_from(away_road),
-            "last10": _record_from(away_last10),
-            "streak": _streak(away_games),
-            **_rest_days(away_games, target_date),
-        },
-        "home": {
-            "team": home_team,
-            "homeRecord": _record_from(home_home),
-            "last10": _record_from(home_last10),
-            "streak": _streak(home_games),
-            **_rest_days(home_games, target_date),
-        },
-        "h2hLast10": {"awayWins": away_wins, "homeWins": home_wins, "games": int(len(h2h))},
+        "games": [{"gameId": g.get("GAME_ID"), "matchup": g.get("MATCHUP"), **ins} for g, ins in zip(games, insights)],
     }
+
+
+def get_slate_insights(*, target_date: date) -> dict:
+    """Insights for every game on `target_date`, cached per date until games.csv changes."""
+    ds = STORE.get("nba_games")
+    slates = ds.derived("slates", lambda _: OrderedDict())
+    key = target_date.isoformat()
+    with _SLATES_LOCK:
+        if key in slates:
+            slates.move_to_end(key)
+            return slates[key]
+
+    slate = _slate(ds, target_date)  # built outside the lock; a concurrent duplicate is harmless
+    with _SLATES_LOCK:
+        slate = slates.setdefault(key, slate)
+        slates.move_to_end(key)
+        while len(slates) > SLATE_CACHE_SIZE:
+            slates.popitem(last=False)
+    return slate
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# the backend uses absolute `src....` imports rooted at backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,39 @@
+# tests/test_csv_resp.py
+import json
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_fields_keep_the_requested_order(client):
+    resp = client.get("/api/nba/teams?fields=TEAM_NAME,TEAM_ID&limit=2")
+    assert resp.status_code == 200
+    rows = json.loads(resp.data)
+    assert rows and all(list(r) == ["TEAM_NAME", "TEAM_ID"] for r in rows)
+
+
+def test_fields_order_in_ndjson(client):
+    resp = client.get("/api/nba/teams?fields=TEAM_NAME,TEAM_ID&limit=2", headers={"Accept": "application/x-ndjson"})
+    rows = [json.loads(line) for line in resp.data.splitlines()]
+    assert rows and all(list(r) == ["TEAM_NAME", "TEAM_ID"] for r in rows)
+
+
+def test_not_modified_carries_the_matching_etag(client):
+    gz = client.get("/api/nba/teams", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/api/nba/teams", headers={"Accept-Encoding": "identity"})
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gz.headers["ETag"] != plain.headers["ETag"]
+
+    resp = client.get("/api/nba/teams", headers={"Accept-Encoding": "gzip", "If-None-Match": gz.headers["ETag"]})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == gz.headers["ETag"]
+
+    resp = client.get("/api/nba/teams", headers={"Accept-Encoding": "identity", "If-None-Match": plain.headers["ETag"]})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == plain.headers["ETag"]
@@ -0,0 +1,60 @@
+# tests/test_nba_game_logs.py
+from pathlib import Path
+
+import pandas as pd
+
+from src.common.datasets import Dataset
+from src.leagues.nba.api import nba_game_logs
+
+
+def _logs() -> Dataset:
+    rows = [
+        # player 1: 2 games, fewer than the default last_n
+        (1, "2026-01-02", "LAL vs. BOS", "BOS", True),
+        (1, "2026-01-01", "LAL @ NYK", "NYK", False),
+        # player 2: 6 games, right after player 1 in the index
+        *[(2, f"2026-01-0{d}", "BOS @ LAL", "LAL", False) for d in range(1, 7)],
+    ]
+    df = pd.DataFrame(rows, columns=["PLAYER_ID", "GAME_DATE", "MATCHUP", "OPP_TEAM_ABBR", "IS_HOME"])
+    df["IS_AWAY"] = ~df["IS_HOME"]
+    return Dataset(key="nba_player_game_logs", path=Path("logs.csv"), version=1, df=df)
+
+
+def _use(monkeypatch, ds: Dataset) -> None:
+    index = nba_game_logs._build_index(ds)
+    monkeypatch.setattr(nba_game_logs, "load_player_log_index", lambda: index)
+
+
+def test_last_n_stays_within_the_players_games(monkeypatch):
+    _use(monkeypatch, _logs())
+
+    rows = nba_game_logs.get_player_gamelog(1, last_n=10)
+
+    assert [r["PLAYER_ID"] for r in rows] == [1, 1]
+    assert [r["GAME_DATE"] for r in rows] == ["2026-01-02", "2026-01-01"]
+
+
+def test_last_n_truncates_newest_first(monkeypatch):
+    _use(monkeypatch, _logs())
+
+    rows = nba_game_logs.get_player_gamelog(2, last_n=3)
+
+    assert [r["GAME_DATE"] for r in rows] == ["2026-01-06", "2026-01-05", "2026-01-04"]
+
+
+def test_filtered_and_unknown_players(monkeypatch):
+    _use(monkeypatch, _logs())
+
+    assert [r["OPP_TEAM_ABBR"] for r in nba_game_logs.get_player_gamelog(1, last_n=10, home=True)] == ["BOS"]
+    assert nba_game_logs.get_player_gamelog(3) == []
+
+
+def test_missing_opponents_stay_missing():
+    ds = _logs()
+    ds.df["OPP_TEAM_ABBR"] = pd.Series(["bos", None, *["lal"] * 6], dtype="category")
+
+    index = nba_game_logs._build_index(ds)
+
+    assert pd.isna(index.opp).tolist() == [False, True] + [False] * 6
+    assert "NAN" not in [r["OPP_TEAM_ABBR"] for r in index.records]
+    assert index.opp[0] == "BOS"
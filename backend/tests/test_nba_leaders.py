@@ -0,0 +1,14 @@
+# tests/test_nba_leaders.py
+from src.leagues.nba.api import nba_leaders
+
+
+def test_custom_cards_do_not_evict_the_warmed_defaults():
+    nba_leaders.get_leaders_payload()
+    warmed = set(nba_leaders._PAYLOAD_CACHE)
+    assert len(warmed) >= len(nba_leaders.WARM_DEFAULTS)
+
+    for i in range(2 * nba_leaders._PAYLOAD_CACHE_SIZE):
+        nba_leaders.get_leaders_payload(custom=nba_leaders.custom_card(f"PTS + {i}"))
+
+    assert warmed <= set(nba_leaders._PAYLOAD_CACHE)
+    assert len(nba_leaders._CUSTOM_PAYLOAD_CACHE) == nba_leaders._CUSTOM_PAYLOAD_CACHE_SIZE
@@ -0,0 +1,25 @@
+# tests/test_nba_matchup_insights.py
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from src.common.datasets import STORE, Dataset
+from src.leagues.nba.trends import matchup_insights
+
+
+def _games(version: int, rows) -> Dataset:
+    df = pd.DataFrame(rows, columns=["GAME_ID", "GAME_DATE_EST", "HOME_TEAM", "AWAY_TEAM", "HOME_PTS", "AWAY_PTS",
+                                     "STATUS", "MATCHUP"])
+    return Dataset(key="nba_games", path=Path("games.arrow"), version=version, df=df)
+
+
+def test_slate_reads_the_schedule_of_its_own_version(monkeypatch):
+    old = _games(1, [(1, "2026-01-10", "Lakers", "Celtics", None, None, "7:30 pm ET", "Celtics @ Lakers")])
+    new = _games(2, [(2, "2026-01-10", "Knicks", "Heat", None, None, "7:30 pm ET", "Heat @ Knicks")])
+    # a reload lands between the caller's STORE.get and the schedule lookup
+    monkeypatch.setattr(STORE, "get", lambda key: new)
+
+    slate = matchup_insights._slate(old, date(2026, 1, 10))
+
+    assert [g["gameId"] for g in slate["games"]] == [1]
@@ -0,0 +1,111 @@
+# tests/test_nba_player_game_logs.py
+import json
+import time
+
+import pandas as pd
+import pytest
+from nba_api.stats.library.http import NBAStatsResponse
+
+from src.leagues.nba.pipeline import player_game_logs, stats_client
+
+HEAD = ["SEASON_ID", "Player_ID", "Game_ID", "GAME_DATE", "MATCHUP", "WL", "MIN", "PTS", "REB", "AST"]
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    """Stats client not installed yet (and uncached once it is); no dataset writes."""
+    monkeypatch.setenv("NBA_STATS_CACHE", "off")
+    monkeypatch.setenv("NBA_STATS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(stats_client, "STATS_CACHE", None)
+    monkeypatch.setattr(player_game_logs, "write_dataset", lambda df, key: None)
+    yield
+    stats_client.uninstall()
+
+
+@pytest.fixture
+def upstream(pipeline, monkeypatch):
+    """Fake stats.nba.com behind nba_api."""
+    sent = []
+
+    def send(self, endpoint, parameters, *args, **kwargs):
+        sent.append(time.monotonic())
+        pid = int(dict(parameters)["PlayerID"])
+        row = ["22025", pid, "0022500001", "JAN 18, 2026", "LAL vs. BOS", "W", 30, 20, 5, 5]
+        body = json.dumps({"resultSets": [{"name": "PlayerGameLog", "headers": HEAD, "rowSet": [row]}]})
+        return NBAStatsResponse(response=body, status_code=200, url=None)
+
+    monkeypatch.setattr(stats_client, "_send_api_request", send)
+    monkeypatch.setattr(
+        player_game_logs,
+        "_load_player_index",
+        lambda: pd.DataFrame({"PLAYER_ID": [1, 2, 3, 4], "PLAYER_NAME": ["A", "B", "C", "D"]}),
+    )
+    return sent
+
+
+def test_direct_build_is_paced(upstream):
+    df = player_game_logs.build_player_game_logs_csv(season="2025-26", workers=4, rate_per_s=10)
+
+    assert len(df) == 4
+    assert len(upstream) == 4
+    # burst of 1, then one request per 1/rate seconds across all workers
+    assert upstream[-1] - upstream[0] >= 3 / 10 * 0.9
+
+
+def test_direct_fetch_uses_the_configured_base_url(upstream, monkeypatch):
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    from src.leagues.nba.pipeline import standings
+
+    monkeypatch.setattr(stats_client, "STATS_BASE_URL", "http://127.0.0.1:9/stats/{endpoint}")
+    cols = ["TeamID", "TeamName", "Conference", "ConferenceRecord",
+            "Division", "DivisionRecord", "WINS", "LOSSES", "WinPCT"]
+    seen = []
+
+    def send(self, endpoint, parameters, *args, **kwargs):
+        seen.append((endpoint, NBAStatsHTTP.base_url))
+        body = json.dumps({"resultSets": [{"name": "Standings", "headers": cols, "rowSet": []}]})
+        return NBAStatsResponse(response=body, status_code=200, url=None)
+
+    monkeypatch.setattr(stats_client, "_send_api_request", send)
+
+    standings.fetch_standings(2026)
+
+    assert seen == [("leaguestandings", "http://127.0.0.1:9/stats/{endpoint}")]
+
+
+def _league_rows(rows):
+    cols = ["PLAYER_ID", "PLAYER_NAME", "GAME_ID", "GAME_DATE", "MATCHUP", "WL", "MIN", "PTS", "REB", "AST"]
+    return pd.DataFrame([(pid, f"P{pid}", gid, day, "LAL vs. BOS", "W", 30, 20, 5, 5) for pid, gid, day in rows],
+                        columns=cols)
+
+
+def test_bulk_incremental_backfills_the_player_stored_least(pipeline, monkeypatch):
+    stored = _league_rows([(1, 1, "2026-01-10"), (2, 1, "2026-01-10"), (2, 3, "2026-01-20")])
+    stored["SEASON"], stored["SEASON_TYPE"] = "2025-26", "Regular Season"
+    monkeypatch.setattr(player_game_logs, "read_dataset", lambda key: player_game_logs.conform(stored, key))
+
+    asked = {}
+
+    def league_log(**kwargs):
+        asked.update(kwargs)
+        # every player-game from date_from on: player 1's 01-15 game was never stored
+        return _league_rows([(1, 1, "2026-01-10"), (2, 1, "2026-01-10"), (1, 2, "2026-01-15"),
+                             (2, 3, "2026-01-20")])
+
+    monkeypatch.setattr(player_game_logs, "fetch_league_player_logs", league_log)
+
+    df = player_game_logs.build_player_game_logs_csv(season="2025-26", bulk=True, incremental=True)
+
+    assert asked["date_from"] == "2026-01-10"
+    got = sorted(zip(df["PLAYER_ID"].astype(int), df["GAME_ID"].astype(int)))
+    assert got == [(1, 1), (1, 2), (2, 1), (2, 3)]
+
+
+def test_unparseable_matchups_leave_the_opponent_missing():
+    out = pd.DataFrame({"MATCHUP": ["LAL @ BOS", "LAL vs. nyk", "TBD", None]})
+
+    player_game_logs._matchup_columns(out)
+
+    assert out["OPP_TEAM_ABBR"].tolist()[:2] == ["BOS", "nyk"]
+    assert out["OPP_TEAM_ABBR"].isna().tolist() == [False, False, True, True]
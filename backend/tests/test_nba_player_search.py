@@ -0,0 +1,34 @@
+# tests/test_nba_player_search.py
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.common.datasets import Dataset
+from src.leagues.nba.api.nba_player_search import _build_index, normalize_name
+
+
+@pytest.mark.parametrize(
+    "name, key",
+    [
+        ("Nikola Jokić", "nikola jokic"),
+        ("Nikola Đurišić", "nikola durisic"),
+        ("ĐORĐE", "dorde"),
+        ("Søren Østergaard", "soren ostergaard"),
+        ("Łukasz", "lukasz"),
+        ("Strauß", "strauss"),
+        ("Ægir", "aegir"),
+        ("Þór", "thor"),
+        ("D'Angelo Russell", "dangelo russell"),
+    ],
+)
+def test_normalize_name_folds_letters_without_a_decomposition(name, key):
+    assert normalize_name(name) == key
+
+
+def test_search_matches_transliterated_names():
+    df = pd.DataFrame({"PLAYER_ID": [1, 2], "PLAYER_NAME": ["Nikola Đurišić", "Nikola Jokić"]})
+    idx = _build_index(Dataset(key="nba_roster_master", path=Path("r.csv"), version=1, df=df))
+
+    assert [p["playerId"] for p in idx.search("durisic")] == [1]
+    assert [p["playerId"] for p in idx.search("Đuri")] == [1]
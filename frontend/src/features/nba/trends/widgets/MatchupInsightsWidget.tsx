@@ -44,6 +44,11 @@ type MatchupInsights = {
   h2hLast10: { awayWins: number; homeWins: number; games: number };
 };
 
+type SlateInsights = {
+  date: string;
+  games: (MatchupInsights & { gameId: number; matchup?: string | null })[];
+};
+
 function fmtWL(wl?: WL) {
   if (!wl) return "—";
   return `${wl.w}-${wl.l}`;
@@ -89,7 +94,8 @@ export default function MatchupInsightsWidget() {
   const [matchups, setMatchups] = useState<DailyScheduleRow[]>([]);
   const [selectedGameId, setSelectedGameId] = useState<number | null>(null);
 
-  const [insights, setInsights] = useState<MatchupInsights | null>(null);
+  // All insights for the selected date, keyed by GAME_ID (one request per slate)
+  const [slate, setSlate] = useState<Record<number, MatchupInsights>>({});
 
   const [loadingMatchups, setLoadingMatchups] = useState(false);
   const [loadingInsights, setLoadingInsights] = useState(false);
@@ -130,13 +136,11 @@ export default function MatchupInsightsWidget() {
           setSelectedGameId(rows[0].GAME_ID);
         } else {
           setSelectedGameId(null);
-          setInsights(null);
         }
       } catch {
         if (!cancelled) {
           setMatchups([]);
           setSelectedGameId(null);
-          setInsights(null);
         }
       } finally {
         if (!cancelled) setLoadingMatchups(false);
@@ -149,40 +153,41 @@ export default function MatchupInsightsWidget() {
     };
   }, [dateStr]);
 
-  // Load insights when matchup changes
+  // Load insights for the whole slate when the date changes
   useEffect(() => {
-    if (!selectedMatchup) return;
-
     let cancelled = false;
 
-    async function loadInsights() {
+    async function loadSlate() {
       try {
         setLoadingInsights(true);
-        const res = await apiClient.get<MatchupInsights>(
-          "/nba/trends/matchup-insights",
+        const res = await apiClient.get<SlateInsights>(
+          "/nba/trends/matchup-insights/slate",
           {
-            params: {
-              date: dateStr,
-              away: selectedMatchup?.AWAY_TEAM,
-              home: selectedMatchup?.HOME_TEAM,
-            },
+            params: { date: dateStr },
           },
         );
 
         if (cancelled) return;
-        setInsights(res.data ?? null);
+        const byGame: Record<number, MatchupInsights> = {};
+        for (const g of res.data?.games ?? []) byGame[g.gameId] = g;
+        setSlate(byGame);
       } catch {
-        if (!cancelled) setInsights(null);
+        if (!cancelled) setSlate({});
       } finally {
         if (!cancelled) setLoadingInsights(false);
       }
     }
 
-    loadInsights();
+    loadSlate();
     return () => {
       cancelled = true;
     };
-  }, [dateStr, selectedMatchup]);
+  }, [dateStr]);
+
+  const insights = useMemo<MatchupInsights | null>(() => {
+    if (selectedGameId == null) return null;
+    return slate[selectedGameId] ?? null;
+  }, [slate, selectedGameId]);
 
   useEffect(() => {
     let cancelled = false;